@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Measure how long it takes to remove bindings depending on the total number of live bindings.
+
+Run with `python benchmarks/binding_removal.py`.
+The time for removing a fixed number of objects should stay roughly constant while the total number grows.
+"""
+import time
+
+from nicegui import binding
+
+
+class Model:
+    value = binding.BindableProperty()
+
+    def __init__(self) -> None:
+        self.value = 0
+
+
+def measure(total: int, removed: int) -> float:
+    count = len(binding.bindable_properties)
+    sources = [Model() for _ in range(total)]
+    targets = [{'value': None} for _ in range(total)]
+    for source, target in zip(sources, targets):
+        binding.bind_to(source, 'value', target, 'value', lambda x: x)
+    t = time.perf_counter()
+    binding.remove(sources[:removed], Model)
+    duration = time.perf_counter() - t
+    binding.remove(sources, Model)
+    assert not binding.bindings and len(binding.bindable_properties) == count
+    return duration
+
+
+if __name__ == '__main__':
+    print(f'{"bindings":>10} {"removed":>8} {"duration":>12}')
+    for total in [1_000, 10_000, 100_000]:
+        for removed in [10, 1_000]:
+            print(f'{total:>10} {removed:>8} {measure(total, removed) * 1000:>9.3f} ms')
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Measure how much memory the elements of a page take.
+
+Run with `python benchmarks/element_memory.py`.
+The memory is traced while creating plain labels and buttons with a click handler in a single client.
+"""
+import gc
+import tracemalloc
+
+from nicegui import Client, ui
+from nicegui.page import page
+
+
+def measure(count: int, create) -> float:
+    client = Client(page('/'))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    with client:
+        for i in range(count):
+            create(i)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+if __name__ == '__main__':
+    print(f'{"elements":>10} {"labels":>14} {"buttons":>14}')
+    for count in [1_000, 100_000]:
+        labels = measure(count, lambda i: ui.label(f'label {i}'))
+        buttons = measure(count, lambda i: ui.button(f'button {i}', on_click=lambda: None))
+        print(f'{count:>10} {labels:>8.0f} bytes {buttons:>8.0f} bytes')
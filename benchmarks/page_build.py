@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Measure how long it takes to deliver a page with a long list of styled elements.
+
+Run with `python benchmarks/page_build.py`.
+The elements are created one by one like in a typical page builder.
+Each run includes rendering the response and collecting the frames the outbox would send afterwards.
+The best of five runs is reported.
+"""
+import gc
+import time
+
+from starlette.requests import Request
+
+from nicegui import Client, globals, outbox, ui  # pylint: disable=redefined-builtin
+from nicegui.page import page
+
+REQUEST_SCOPE = {'type': 'http', 'method': 'GET', 'path': '/', 'headers': [], 'query_string': b''}
+
+
+def build_one_by_one(count: int) -> None:
+    with ui.column():
+        for i in range(count):
+            ui.label(f'item {i}').classes('text-lg font-bold').style('color: red; margin: 4px').props('dense')
+
+
+def measure(count: int, build, repetitions: int = 5) -> float:
+    durations = []
+    for _ in range(repetitions):
+        client = Client(page('/'))
+        gc.collect()
+        t = time.perf_counter()
+        with client:
+            build(count)
+        client.build_response(Request(REQUEST_SCOPE))
+        outbox._collect_frames()  # pylint: disable=protected-access
+        durations.append(time.perf_counter() - t)
+        del globals.clients[client.id]
+    return min(durations)
+
+
+if __name__ == '__main__':
+    # NOTE: the page configuration which is usually set by `ui.run`
+    globals.title, globals.viewport, globals.favicon, globals.dark, globals.language = \
+        'NiceGUI', 'width=device-width, initial-scale=1', None, False, 'en-US'
+    globals.tailwind = globals.prod_js = True
+    print(f'{"elements":>10} {"duration":>14}')
+    for count in [1_000, 10_000]:
+        print(f'{count:>10} {measure(count, build_one_by_one) * 1000:>11.1f} ms')
@@ -10,8 +10,8 @@ messages: List[Tuple[str, str, str, str]] = []
 
 @ui.refreshable
 async def chat_messages(own_id: str) -> None:
-    for user_id, avatar, text, stamp in messages:
-        ui.chat_message(text=text, stamp=stamp, avatar=avatar, sent=own_id == user_id)
+    for index, (user_id, avatar, text, stamp) in enumerate(messages):
+        ui.chat_message(text=text, stamp=stamp, avatar=avatar, sent=own_id == user_id).keyed(index)
     await ui.run_javascript('window.scrollTo(0, document.body.scrollHeight)', respond=False)
 
 
@@ -0,0 +1,69 @@
+"""Binary transport of NumPy arrays
+
+Numeric NumPy arrays in outgoing socket messages are replaced by placeholders carrying the raw array buffer.
+Socket.IO sends these buffers as binary attachments and the browser turns them back into typed arrays
+without encoding or parsing any text.
+"""
+from typing import Any, Dict
+
+try:
+    import numpy as np
+    has_numpy = True
+except ImportError:
+    has_numpy = False
+
+MARKER = '__nicegui_array__'
+
+TYPED_ARRAYS: Dict[str, str] = {
+    'int8': 'Int8Array',
+    'uint8': 'Uint8Array',
+    'int16': 'Int16Array',
+    'uint16': 'Uint16Array',
+    'int32': 'Int32Array',
+    'uint32': 'Uint32Array',
+    'float32': 'Float32Array',
+    'float64': 'Float64Array',
+}
+CONVERSIONS: Dict[str, str] = {  # NOTE: dtypes without a JavaScript counterpart that consumers can handle
+    'int64': 'float64',
+    'uint64': 'float64',
+    'float16': 'float32',
+}
+
+
+def encode(data: Any) -> Any:
+    """Replace numeric NumPy arrays with placeholders holding their binary buffer.
+
+    Containers are only copied if they (indirectly) contain an array, the original data is never modified.
+    """
+    if not has_numpy:
+        return data
+    return _encode(data)
+
+
+def _encode(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        result = None
+        for key, value in obj.items():
+            encoded = _encode(value)
+            if encoded is not value:
+                if result is None:
+                    result = dict(obj)
+                result[key] = encoded
+        return obj if result is None else result
+    if isinstance(obj, (list, tuple)):
+        items = None
+        for i, value in enumerate(obj):
+            encoded = _encode(value)
+            if encoded is not value:
+                if items is None:
+                    items = list(obj)
+                items[i] = encoded
+        return obj if items is None else items
+    if isinstance(obj, np.ndarray):
+        dtype = CONVERSIONS.get(obj.dtype.name, obj.dtype.name)
+        if dtype not in TYPED_ARRAYS or obj.size == 0:
+            return obj
+        array = np.ascontiguousarray(obj, dtype=np.dtype(dtype).newbyteorder('<'))
+        return {MARKER: TYPED_ARRAYS[dtype], 'shape': list(array.shape), 'buffer': array.tobytes()}
+    return obj
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import urllib.parse
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple, Union
+
+from nicegui import json
+
+from . import background_tasks, globals, observables  # pylint: disable=redefined-builtin
+from .storage import PersistentDict
+
+MessageHandler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class Backend:
+
+    def __init__(self) -> None:
+        """In-process backend
+
+        The backend keeps track of which worker owns which client,
+        routes messages between workers and stores the individual user storage.
+        This default implementation keeps everything within the current process,
+        which is all that is needed when running a single worker.
+        """
+        self.worker_id = str(uuid.uuid4())
+        self.message_handler: Optional[MessageHandler] = None
+
+    async def start(self, message_handler: MessageHandler) -> None:
+        """Start the backend and handle messages forwarded from other workers."""
+        self.message_handler = message_handler
+
+    async def stop(self) -> None:
+        """Stop the backend."""
+
+    def register_client(self, client_id: str) -> None:
+        """Announce that the client is owned by this worker."""
+
+    def unregister_client(self, client_id: str) -> None:
+        """Announce that the client does not exist anymore."""
+
+    async def find_owner(self, client_id: str) -> Optional[str]:
+        """Return the ID of the worker owning the client (or `None` if the client is unknown)."""
+        return self.worker_id if client_id in globals.clients else None
+
+    async def forward(self, worker_id: str, message: Dict[str, Any]) -> bool:
+        """Send a message to another worker.
+
+        :return: whether the worker is still running and received the message
+        """
+        raise RuntimeError(f'worker {worker_id} is not reachable with an in-process backend')
+
+    def create_user_storage(self, session_id: str) -> observables.ObservableDict:
+        """Create the individual storage for the user with the given session ID."""
+        return PersistentDict(globals.storage_path / f'storage_user_{session_id}.json')
+
+    async def refresh_user_storage(self, session_id: str, storage: observables.ObservableDict) -> None:
+        """Bring the individual user storage up to date with changes made by other workers."""
+
+
+class RedisConnection:
+
+    def __init__(self, url: str) -> None:
+        """Minimal asyncio client for the Redis serialization protocol (RESP)."""
+        self.url = urllib.parse.urlparse(url)
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.lock: Optional[asyncio.Lock] = None
+
+    async def connect(self) -> None:
+        self.lock = asyncio.Lock()
+        self.reader, self.writer = \
+            await asyncio.open_connection(self.url.hostname or 'localhost', self.url.port or 6379)
+        if self.url.password:
+            await self.execute('AUTH', *([self.url.username] if self.url.username else []), self.url.password)
+        if self.url.path.strip('/'):
+            await self.execute('SELECT', self.url.path.strip('/'))
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def send(self, *args: Union[str, bytes, int]) -> None:
+        assert self.writer is not None
+        parts = [f'*{len(args)}\r\n'.encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f'${len(data)}\r\n'.encode() + data + b'\r\n')
+        self.writer.write(b''.join(parts))
+        await self.writer.drain()
+
+    async def read(self) -> Any:
+        assert self.reader is not None
+        line = (await self.reader.readuntil(b'\r\n'))[:-2]
+        kind, rest = line[:1], line[1:]
+        if kind == b'+':
+            return rest.decode()
+        if kind == b'-':
+            raise RuntimeError(f'Redis error: {rest.decode()}')
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            return None if length < 0 else (await self.reader.readexactly(length + 2))[:-2].decode()
+        if kind == b'*':
+            length = int(rest)
+            return None if length < 0 else [await self.read() for _ in range(length)]
+        raise RuntimeError(f'unexpected Redis reply: {line!r}')
+
+    async def execute(self, *args: Union[str, bytes, int]) -> Any:
+        assert self.lock is not None
+        async with self.lock:
+            await self.send(*args)
+            return await self.read()
+
+
+class RedisBackend(Backend):
+    CLIENTS_KEY = 'nicegui:clients'
+    USER_KEY_PREFIX = 'nicegui:user:'
+    WORKER_CHANNEL_PREFIX = 'nicegui:worker:'
+
+    def __init__(self, url: str = 'redis://localhost:6379') -> None:
+        """Redis backend
+
+        Shares the client registry, message routing and individual user storage
+        between multiple workers or nodes via a server speaking the Redis protocol.
+
+        :param url: URL of the Redis server (default: "redis://localhost:6379")
+        """
+        super().__init__()
+        self.url = url
+        self.connection = RedisConnection(url)
+        self.subscription = RedisConnection(url)
+        self.pending: Deque[Tuple[Union[str, bytes, int], ...]] = deque()
+        self.pending_event: Optional[asyncio.Event] = None
+        self.local_clients: Set[str] = set()
+
+    async def start(self, message_handler: MessageHandler) -> None:
+        await super().start(message_handler)
+        await self.connection.connect()
+        await self.subscription.connect()
+        await self.subscription.send('SUBSCRIBE', self.WORKER_CHANNEL_PREFIX + self.worker_id)
+        await self.subscription.read()
+        self.pending_event = asyncio.Event()
+        background_tasks.create(self._write_pending(), name='redis backend writer')
+        background_tasks.create(self._receive(), name='redis backend receiver')
+
+    async def stop(self) -> None:
+        try:
+            if self.local_clients:
+                await self.connection.execute('HDEL', self.CLIENTS_KEY, *self.local_clients)
+        except (OSError, asyncio.IncompleteReadError):
+            globals.log.warning('could not unregister clients from Redis server')
+        await self.subscription.close()
+        await self.connection.close()
+
+    def _write(self, *args: Union[str, bytes, int]) -> None:
+        self.pending.append(args)
+        if self.pending_event is not None:
+            self.pending_event.set()
+
+    async def _write_pending(self) -> None:
+        assert self.pending_event is not None
+        while True:
+            if not self.pending:
+                self.pending_event.clear()
+                await self.pending_event.wait()
+            while self.pending:
+                try:
+                    await self.connection.execute(*self.pending.popleft())
+                except Exception as e:
+                    globals.handle_exception(e)
+
+    async def _receive(self) -> None:
+        while True:
+            try:
+                reply = await self.subscription.read()
+            except asyncio.IncompleteReadError:
+                globals.log.warning('lost connection to Redis server')
+                return
+            if not isinstance(reply, list) or reply[0] != 'message':
+                continue
+            try:
+                assert self.message_handler is not None
+                result = self.message_handler(json.loads(reply[2]))
+                if isinstance(result, Awaitable):
+                    await result
+            except Exception as e:
+                globals.handle_exception(e)
+
+    def register_client(self, client_id: str) -> None:
+        self.local_clients.add(client_id)
+        self._write('HSET', self.CLIENTS_KEY, client_id, self.worker_id)
+
+    def unregister_client(self, client_id: str) -> None:
+        self.local_clients.discard(client_id)
+        self._write('HDEL', self.CLIENTS_KEY, client_id)
+
+    async def find_owner(self, client_id: str) -> Optional[str]:
+        if client_id in globals.clients:
+            return self.worker_id
+        return await self.connection.execute('HGET', self.CLIENTS_KEY, client_id)
+
+    async def forward(self, worker_id: str, message: Dict[str, Any]) -> bool:
+        channel = self.WORKER_CHANNEL_PREFIX + worker_id
+        return await self.connection.execute('PUBLISH', channel, json.dumps(message)) > 0
+
+    def create_user_storage(self, session_id: str) -> observables.ObservableDict:
+        return RedisDict(self, self.USER_KEY_PREFIX + session_id)
+
+    def _is_pending(self, key: str) -> bool:
+        return any(len(command) > 1 and command[1] == key for command in self.pending)
+
+    async def refresh_user_storage(self, session_id: str, storage: observables.ObservableDict) -> None:
+        key = self.USER_KEY_PREFIX + session_id
+        if self._is_pending(key):
+            return  # NOTE: the local data is newer than the one on the server
+        data = await self.connection.execute('GET', key)
+        if data is not None and not self._is_pending(key):  # NOTE: the local data might have changed meanwhile
+            dict.clear(storage)
+            for key, value in json.loads(data).items():
+                dict.__setitem__(storage, key, observables.make_observable(value, storage.on_change))
+
+
+class RedisDict(observables.ObservableDict):
+
+    def __init__(self, backend: RedisBackend, key: str) -> None:
+        self.backend = backend
+        self.key = key
+        super().__init__({}, self.backup)
+
+    def backup(self) -> None:
+        self.backend._write('SET', self.key, json.dumps(self))  # pylint: disable=protected-access
@@ -1,4 +1,6 @@
 import asyncio
+import inspect
+import itertools
 import time
 from collections import defaultdict
 from collections.abc import Mapping
@@ -10,7 +12,15 @@ MAX_PROPAGATION_TIME = 0.01
 
 bindings: DefaultDict[Tuple[int, str], List] = defaultdict(list)
 bindable_properties: Dict[Tuple[int, str], Any] = {}
-active_links: List[Tuple[Any, str, Any, str, Callable[[Any], Any]]] = []
+active_links: Dict[int, Tuple[Any, str, Any, str, Callable[[Any], Any]]] = {}
+changed_attributes: Dict[Tuple[int, str], Any] = {}
+polled_attributes: Dict[Tuple[int, str], Any] = {}  # NOTE: observed attributes holding values which can be mutated
+
+# NOTE: reverse index from object ID to the keys of its bindings and bindable properties as well as its active links
+keys_by_object: DefaultDict[int, Set[Tuple[int, str]]] = defaultdict(set)
+links_by_object: DefaultDict[int, Set[int]] = defaultdict(set)
+link_ids = itertools.count()
+change_event: Optional[asyncio.Event] = None
 
 
 def has_attribute(obj: Union[object, Mapping], name: str) -> Any:
@@ -33,25 +43,115 @@ def set_attribute(obj: Union[object, Mapping], name: str, value: Any) -> None:
 
 
 async def loop() -> None:
+    """Propagate reported attribute changes and poll the attributes that cannot be observed."""
+    global change_event  # pylint: disable=global-statement
+    change_event = asyncio.Event()
+    next_poll = time.time()
     while True:
+        timeout = max(next_poll - time.time(), 0) if active_links or polled_attributes else None
+        try:
+            await asyncio.wait_for(change_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        change_event.clear()
         visited: Set[Tuple[int, str]] = set()
         t = time.time()
-        for link in active_links:
-            (source_obj, source_name, target_obj, target_name, transform) = link
-            if has_attribute(source_obj, source_name):
-                value = transform(get_attribute(source_obj, source_name))
-                if not has_attribute(target_obj, target_name) or get_attribute(target_obj, target_name) != value:
-                    set_attribute(target_obj, target_name, value)
-                    propagate(target_obj, target_name, visited)
-            del link, source_obj, target_obj  # pylint: disable=modified-iterating-list
+        while changed_attributes:
+            (_, name), obj = changed_attributes.popitem()
+            propagate(obj, name, visited)
+            del obj
+        if (active_links or polled_attributes) and t >= next_poll:
+            poll(visited)
+            next_poll = t + globals.binding_refresh_interval
         if time.time() - t > MAX_PROPAGATION_TIME:
-            globals.log.warning(
-                f'binding propagation for {len(active_links)} active links took {time.time() - t:.3f} s')
-        await asyncio.sleep(globals.binding_refresh_interval)
+            globals.log.warning(f'binding propagation for {len(active_links)} active links '
+                                f'and {len(polled_attributes)} polled attributes took {time.time() - t:.3f} s')
+
+
+def poll(visited: Set[Tuple[int, str]]) -> None:
+    for link in list(active_links.values()):
+        (source_obj, source_name, target_obj, target_name, transform) = link
+        if has_attribute(source_obj, source_name):
+            value = transform(get_attribute(source_obj, source_name))
+            if not has_attribute(target_obj, target_name) or get_attribute(target_obj, target_name) != value:
+                set_attribute(target_obj, target_name, value)
+                propagate(target_obj, target_name, visited)
+        del link, source_obj, target_obj  # pylint: disable=modified-iterating-list
+    for (_, name), obj in list(polled_attributes.items()):
+        propagate(obj, name, visited)  # NOTE: the value might have been mutated in place
+        del obj
+
+
+def report_change(obj: Any, name: str) -> None:
+    """Queue the attribute of an observed object for propagation."""
+    changed_attributes[(id(obj), name)] = obj
+    if change_event is None or globals.loop is None:
+        return
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is globals.loop:
+        change_event.set()
+    else:
+        globals.loop.call_soon_threadsafe(change_event.set)
+
+
+def _is_immutable(value: Any) -> bool:
+    if isinstance(value, tuple):
+        return all(_is_immutable(item) for item in value)
+    return value is None or isinstance(value, (bool, int, float, complex, str, bytes, range, frozenset))
+
+
+def _update_polling(obj: Any, name: str) -> None:
+    """Poll an observed attribute as long as its value could be mutated in place without an assignment."""
+    key = (id(obj), name)
+    if has_attribute(obj, name) and _is_immutable(get_attribute(obj, name)):
+        polled_attributes.pop(key, None)
+    else:
+        polled_attributes[key] = obj
+
+
+def observe(obj: Any, name: str) -> bool:
+    """Hook into the class of the object to get notified about assignments to the attribute.
+
+    This is not possible for mappings, builtin or extension types, classes with their own `__setattr__`
+    and attributes which are computed by descriptors.
+    Such objects need to be polled instead.
+    The hook is installed once per class and costs a dictionary lookup for each assignment to an attribute.
+    Attributes holding mutable values are additionally polled (see `_update_polling`).
+
+    :return: whether the attribute can be observed
+    """
+    if isinstance(obj, Mapping) or inspect.isroutine(obj) or inspect.ismodule(obj) or inspect.isclass(obj):
+        return False
+    cls = type(obj)
+    if hasattr(getattr(cls, name, None), '__get__'):
+        return False
+    if getattr(cls.__setattr__, '__nicegui_hook__', False):
+        return True
+    if cls.__setattr__ is not object.__setattr__:
+        return False
+    original_setattr = cls.__setattr__
+
+    def __setattr__(self: Any, attribute_name: str, value: Any) -> None:
+        original_setattr(self, attribute_name, value)
+        if (id(self), attribute_name) in bindings:
+            _update_polling(self, attribute_name)
+            report_change(self, attribute_name)
+    __setattr__.__nicegui_hook__ = True  # type: ignore
+
+    try:
+        cls.__setattr__ = __setattr__  # type: ignore
+    except (TypeError, AttributeError):
+        return False
+    return True
 
 
 def propagate(source_obj: Any, source_name: str, visited: Optional[Set[Tuple[int, str]]] = None) -> None:
     if visited is None:
+        if (id(source_obj), source_name) not in bindings:
+            return  # NOTE: shortcut for the common case of setting a bindable property which is not bound
         visited = set()
     visited.add((id(source_obj), source_name))
     for _, target_obj, target_name, transform in bindings.get((id(source_obj), source_name), []):
@@ -65,17 +165,31 @@ def propagate(source_obj: Any, source_name: str, visited: Optional[Set[Tuple[int
 
 
 def bind_to(self_obj: Any, self_name: str, other_obj: Any, other_name: str, forward: Callable[[Any], Any]) -> None:
-    bindings[(id(self_obj), self_name)].append((self_obj, other_obj, other_name, forward))
-    if (id(self_obj), self_name) not in bindable_properties:
-        active_links.append((self_obj, self_name, other_obj, other_name, forward))
-    propagate(self_obj, self_name)
+    _add_binding(self_obj, self_name, other_obj, other_name, forward)
 
 
 def bind_from(self_obj: Any, self_name: str, other_obj: Any, other_name: str, backward: Callable[[Any], Any]) -> None:
-    bindings[(id(other_obj), other_name)].append((other_obj, self_obj, self_name, backward))
-    if (id(other_obj), other_name) not in bindable_properties:
-        active_links.append((other_obj, other_name, self_obj, self_name, backward))
-    propagate(other_obj, other_name)
+    _add_binding(other_obj, other_name, self_obj, self_name, backward)
+
+
+def _add_binding(source_obj: Any, source_name: str, target_obj: Any, target_name: str,
+                 transform: Callable[[Any], Any]) -> None:
+    key = (id(source_obj), source_name)
+    bindings[key].append((source_obj, target_obj, target_name, transform))
+    keys_by_object[id(source_obj)].add(key)
+    keys_by_object[id(target_obj)].add(key)
+    if key not in bindable_properties:
+        if isinstance(getattr(type(source_obj), source_name, None), BindableProperty):
+            # NOTE: registered only when bound to keep unbound objects lightweight
+            bindable_properties[key] = source_obj
+        elif observe(source_obj, source_name):
+            _update_polling(source_obj, source_name)
+        else:
+            link_id = next(link_ids)
+            active_links[link_id] = (source_obj, source_name, target_obj, target_name, transform)
+            links_by_object[id(source_obj)].add(link_id)
+            links_by_object[id(target_obj)].add(link_id)
+    propagate(source_obj, source_name)
 
 
 def bind(self_obj: Any, self_name: str, other_obj: Any, other_name: str, *,
@@ -93,6 +207,8 @@ class BindableProperty:
         self.name = name  # pylint: disable=attribute-defined-outside-init
 
     def __get__(self, owner: Any, _=None) -> Any:
+        if owner is None:
+            return self
         return getattr(owner, '___' + self.name)
 
     def __set__(self, owner: Any, value: Any) -> None:
@@ -101,28 +217,47 @@ class BindableProperty:
         if has_attr and not value_changed:
             return
         setattr(owner, '___' + self.name, value)
-        bindable_properties[(id(owner), self.name)] = owner
         propagate(owner, self.name)
         if value_changed and self.on_change is not None:
             self.on_change(owner, value)
 
 
 def remove(objects: List[Any], type_: Type) -> None:
-    active_links[:] = [
-        (source_obj, source_name, target_obj, target_name, transform)
-        for source_obj, source_name, target_obj, target_name, transform in active_links
-        if not (isinstance(source_obj, type_) and source_obj in objects or
-                isinstance(target_obj, type_) and target_obj in objects)
-    ]
-    for key, binding_list in list(bindings.items()):
-        binding_list[:] = [
-            (source_obj, target_obj, target_name, transform)
-            for source_obj, target_obj, target_name, transform in binding_list
-            if not (isinstance(source_obj, type_) and source_obj in objects or
-                    isinstance(target_obj, type_) and target_obj in objects)
-        ]
-        if not binding_list:
-            del bindings[key]
-    for (obj_id, name), obj in list(bindable_properties.items()):
-        if isinstance(obj, type_) and obj in objects:
-            del bindable_properties[(obj_id, name)]
+    """Remove all bindings, active links, polled attributes and bindable properties of the given objects.
+
+    Thanks to the reverse index the effort only depends on the number of objects and their bindings,
+    not on the total number of bindings.
+    """
+    removed_ids = {id(obj) for obj in objects if isinstance(obj, type_)}
+    for obj_id in removed_ids:
+        for link_id in links_by_object.pop(obj_id, ()):
+            link = active_links.pop(link_id, None)
+            if link is not None:
+                for other_id in (id(link[0]), id(link[2])):
+                    if other_id not in removed_ids:
+                        _discard(links_by_object, other_id, link_id)
+        for key in keys_by_object.pop(obj_id, ()):
+            if key[0] in removed_ids:
+                for _, target_obj, _, _ in bindings.pop(key, ()):
+                    if id(target_obj) not in removed_ids:
+                        _discard(keys_by_object, id(target_obj), key)
+            elif key in bindings:
+                binding_list = bindings[key]
+                binding_list[:] = [binding for binding in binding_list if id(binding[1]) not in removed_ids]
+                if not binding_list:
+                    del bindings[key]
+                    polled_attributes.pop(key, None)
+                    if key not in bindable_properties:
+                        _discard(keys_by_object, key[0], key)
+            if key[0] == obj_id:
+                bindable_properties.pop(key, None)
+                changed_attributes.pop(key, None)
+                polled_attributes.pop(key, None)
+
+
+def _discard(index: DefaultDict[int, Set[Any]], obj_id: int, item: Any) -> None:
+    items = index.get(obj_id)
+    if items is not None:
+        items.discard(item)
+        if not items:
+            del index[obj_id]
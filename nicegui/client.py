@@ -1,49 +1,88 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import time
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from fastapi import Request
-from fastapi.responses import Response
+from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
 
 from nicegui import json
 
 from . import __version__, globals, outbox  # pylint: disable=redefined-builtin
-from .dependencies import generate_resources
+from .dependencies import generate_resources, libraries, vue_components
 from .element import Element
 from .favicon import get_favicon_url
+from .helpers import KWONLY_SLOTS
 
 if TYPE_CHECKING:
+    from .functions.shared_tree import shared_tree
     from .page import page
 
 templates = Jinja2Templates(Path(__file__).parent / 'templates')
 
+# NOTE: rendered page shells are split around the per-request parts, i.e. the element JSON and the client ID
+ELEMENTS_PLACEHOLDER = '__nicegui_elements__'
+CLIENT_ID_PLACEHOLDER = '__nicegui_client_id__'
+MAX_PAGE_SHELLS = 100
+page_shells: Dict[Tuple, Tuple[str, str, str]] = {}
+
+CONNECTION_TIMEOUT = 60.0  # NOTE: clients which do not connect in time are deleted
+connection_deadlines: List[Tuple[float, str]] = []  # NOTE: heap of (deadline, client ID)
+
+
+@dataclass(**KWONLY_SLOTS)
+class MemoryUsage:
+    elements: int
+    listeners: int
+    prop_bytes: int
+    queue_bytes: int
+    history_bytes: int  # NOTE: not part of the total, because it is bounded by `outbox_history_bytes` anyway
+
+    @property
+    def total_bytes(self) -> int:
+        return self.prop_bytes + self.queue_bytes
+
 
 class Client:
 
     def __init__(self, page: page, *, shared: bool = False) -> None:
         self.id = str(uuid.uuid4())
         self.created = time.time()
+        self.last_activity = self.created  # NOTE: time of the last event or update, used for hibernation and eviction
+        self.is_hibernating = False
         globals.clients[self.id] = self
+        globals.backend.register_client(self.id)
 
         self.elements: Dict[int, Element] = {}
+        self.prop_bytes = 0  # NOTE: running total of the size of the element data, updated whenever it is encoded
         self.next_element_id: int = 0
         self.is_waiting_for_connection: bool = False
         self.is_waiting_for_disconnect: bool = False
         self.environ: Optional[Dict[str, Any]] = None
         self.shared = shared
+        self.is_building = not shared  # NOTE: until the page is delivered with the full state, updates need not be sent
+        if not shared:
+            heapq.heappush(connection_deadlines, (self.created + CONNECTION_TIMEOUT, self.id))
         self.on_air = False
+        self.remote_workers: Set[str] = set()
+        self.mounted_trees: Dict[str, shared_tree] = {}
+        self.subscriber_ids: Optional[Set[str]] = None  # NOTE: clients showing the shared tree's elements
 
         with Element('q-layout', _client=self).props('view="hhh lpr fff"').classes('nicegui-layout') as self.layout:
             with Element('q-page-container') as self.page_container:
                 with Element('q-page'):
                     self.content = Element('div').classes('nicegui-content')
 
-        self.waiting_javascript_commands: Dict[str, Any] = {}
+        self.waiting_javascript_commands: Dict[str, asyncio.Future] = {}
+        self._connect_waiters: List[asyncio.Future] = []
+        self._disconnect_waiters: List[asyncio.Future] = []
+        self._connection_request_waiters: List[asyncio.Future] = []
 
         self.head_html = ''
         self.body_html = ''
@@ -72,55 +111,174 @@ class Client:
 
     def build_response(self, request: Request, status_code: int = 200) -> Response:
         prefix = request.headers.get('X-Forwarded-Prefix', request.scope.get('root_path', ''))
-        elements = json.dumps({
-            id: element._to_dict() for id, element in self.elements.items()  # pylint: disable=protected-access
-        })
-        socket_io_js_query_params = {**globals.socket_io_js_query_params, 'client_id': self.id}
-        vue_html, vue_styles, vue_scripts, imports, js_imports = generate_resources(prefix, self.elements.values())
-        return templates.TemplateResponse('index.html', {
-            'request': request,
-            'version': __version__,
-            'elements': elements.replace('&', '&amp;')
-                                .replace('<', '&lt;')
-                                .replace('>', '&gt;')
-                                .replace('`', '&#96;'),
+        elements = self.all_elements()
+        elements_json = '{' + ','.join(
+            f'"{element.id}":{element._to_json()}' for element in elements  # pylint: disable=protected-access
+        ) + '}'
+        self.reset_synced_state()
+        self.is_building = False
+        before_elements, before_client_id, after_client_id = self._get_page_shell(prefix, elements)
+        return HTMLResponse(
+            before_elements +
+            elements_json.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('`', '&#96;') +
+            before_client_id + self.id + after_client_id,
+            status_code, {'Cache-Control': 'no-store', 'X-NiceGUI-Content': 'page'},
+        )
+
+    def _get_page_shell(self, prefix: str, elements: List[Element]) -> Tuple[str, str, str]:
+        """Get the rendered page without the element JSON and the client ID.
+
+        The shell only depends on the prefix, the components and libraries in use and the page configuration.
+        So it is rendered once and reused by all requests with the same key.
+        """
+        resource_keys = set()
+        for element in elements:
+            resource_keys.update(library.key for library in element.libraries)
+            if element.component:
+                resource_keys.add(element.component.key)
+        config = {
             'head_html': self.head_html,
-            'body_html': '<style>' + '\n'.join(vue_styles) + '</style>\n' + self.body_html + '\n' + '\n'.join(vue_html),
-            'vue_scripts': '\n'.join(vue_scripts),
-            'imports': json.dumps(imports),
-            'js_imports': '\n'.join(js_imports),
+            'body_html': self.body_html,
             'quasar_config': json.dumps(globals.quasar_config),
             'title': self.page.resolve_title(),
             'viewport': self.page.resolve_viewport(),
             'favicon_url': get_favicon_url(self.page, prefix),
             'dark': str(self.page.resolve_dark()),
             'language': self.page.resolve_language(),
-            'prefix': prefix,
             'tailwind': globals.tailwind,
             'prod_js': globals.prod_js,
-            'socket_io_js_query_params': socket_io_js_query_params,
-            'socket_io_js_extra_headers': globals.socket_io_js_extra_headers,
-            'socket_io_js_transports': globals.socket_io_js_transports,
-        }, status_code, {'Cache-Control': 'no-store', 'X-NiceGUI-Content': 'page'})
+            'socket_io_js_query_params': str(globals.socket_io_js_query_params),
+            'socket_io_js_extra_headers': str(globals.socket_io_js_extra_headers),
+            'socket_io_js_transports': str(globals.socket_io_js_transports),
+        }
+        key = (prefix, frozenset(resource_keys), len(vue_components), len(libraries), tuple(config.values()))
+        shell = page_shells.get(key)
+        if shell is None:
+            vue_html, vue_styles, vue_scripts, imports, js_imports = generate_resources(prefix, elements)
+            html = templates.get_template('index.html').render({
+                **config,
+                'version': __version__,
+                'elements': ELEMENTS_PLACEHOLDER,
+                'body_html': '<style>' + '\n'.join(vue_styles) + '</style>\n' +
+                             self.body_html + '\n' + '\n'.join(vue_html),
+                'vue_scripts': '\n'.join(vue_scripts),
+                'imports': json.dumps(imports),
+                'js_imports': '\n'.join(js_imports),
+                'prefix': prefix,
+                'socket_io_js_query_params': {**globals.socket_io_js_query_params, 'client_id': CLIENT_ID_PLACEHOLDER},
+                'socket_io_js_extra_headers': globals.socket_io_js_extra_headers,
+                'socket_io_js_transports': globals.socket_io_js_transports,
+            })
+            before_elements, rest = html.split(ELEMENTS_PLACEHOLDER, 1)
+            before_client_id, after_client_id = rest.split(CLIENT_ID_PLACEHOLDER, 1)
+            shell = before_elements, before_client_id, after_client_id
+            if len(page_shells) >= MAX_PAGE_SHELLS:
+                del page_shells[next(iter(page_shells))]
+            page_shells[key] = shell
+        return shell
+
+    def all_elements(self) -> List[Element]:
+        """Return the elements of this client including those of the mounted shared trees."""
+        elements = list(self.elements.values())
+        for tree in self.mounted_trees.values():
+            elements.extend(tree.elements())
+        return elements
+
+    def find_element(self, id: int) -> Optional[Element]:  # pylint: disable=redefined-builtin
+        """Find an element of this client or of one of the mounted shared trees by its ID."""
+        element = self.elements.get(id)
+        if element is None:
+            for tree in self.mounted_trees.values():
+                element = tree.client.elements.get(id)
+                if element is not None:
+                    break
+        return element
+
+    def memory_usage(self) -> MemoryUsage:
+        """Estimate the memory used by this client.
+
+        The prop bytes are the size of the element data as JSON when it has last been encoded.
+        The queue bytes are the size of the frames waiting to be sent,
+        the history bytes the size of the frames kept for replaying them after a reconnect.
+        """
+        # pylint: disable=protected-access
+        listeners = sum(len(element._event_listeners) for element in self.elements.values())
+        return MemoryUsage(elements=len(self.elements), listeners=listeners, prop_bytes=self.prop_bytes,
+                           queue_bytes=outbox.queue_bytes(self.id), history_bytes=outbox.history_bytes.get(self.id, 0))
+
+    @property
+    def used_bytes(self) -> int:
+        """Return the total bytes of `memory_usage` without counting the listeners."""
+        return self.prop_bytes + outbox.queue_bytes(self.id)
+
+    def reset_synced_state(self) -> None:
+        """Forget what has been sent to the browser so that the next update of each element is sent in full."""
+        for element in self.elements.values():
+            element._synced_state = None  # pylint: disable=protected-access
+
+    def hibernate(self) -> None:
+        """Release the state that has been sent to the browser and the cached encodings of all elements.
+
+        Afterwards the changes of an element cannot be determined anymore, so its next update is sent in full.
+        """
+        self.reset_synced_state()
+        for element in self.elements.values():
+            element._invalidate()  # pylint: disable=protected-access
+        self.is_hibernating = True
+
+    def wake(self) -> None:
+        """Mark the client as active again."""
+        self.last_activity = time.time()
+        self.is_hibernating = False
 
     async def connected(self, timeout: float = 3.0, check_interval: float = 0.1) -> None:
-        """Block execution until the client is connected."""
+        """Block execution until the client is connected.
+
+        :param timeout: maximum time to wait in seconds
+        :param check_interval: not used anymore (the client is notified by the handshake)
+        """
+        if self.has_socket_connection:
+            return
         self.is_waiting_for_connection = True
-        deadline = time.time() + timeout
-        while not self.has_socket_connection:
-            if time.time() > deadline:
-                raise TimeoutError(f'No connection after {timeout} seconds')
-            await asyncio.sleep(check_interval)
-        self.is_waiting_for_connection = False
+        _resolve(self._connection_request_waiters)
+        try:
+            await _wait(self._connect_waiters, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f'No connection after {timeout} seconds') from None
+        finally:
+            self.is_waiting_for_connection = False
 
     async def disconnected(self, check_interval: float = 0.1) -> None:
-        """Block execution until the client disconnects."""
+        """Block execution until the client disconnects.
+
+        :param check_interval: not used anymore (the client is notified by the disconnect)
+        """
         if not self.has_socket_connection:
             await self.connected()
         self.is_waiting_for_disconnect = True
-        while self.id in globals.clients:
-            await asyncio.sleep(check_interval)
-        self.is_waiting_for_disconnect = False
+        try:
+            await _wait(self._disconnect_waiters, None)
+        finally:
+            self.is_waiting_for_disconnect = False
+
+    async def _connection_requested(self) -> None:
+        """Block execution until the page builder waits for the connection (and the page can be delivered)."""
+        if not self.is_waiting_for_connection:
+            await _wait(self._connection_request_waiters, None)
+
+    def handle_handshake(self) -> None:
+        """Wake up everyone waiting for the connection."""
+        _resolve(self._connect_waiters)
+
+    def handle_disconnect(self) -> None:
+        """Wake up everyone waiting for the disconnect."""
+        _resolve(self._disconnect_waiters)
+
+    def handle_javascript_response(self, msg: Dict) -> None:
+        """Pass the result of a JavaScript command to the waiting `run_javascript` call."""
+        future = self.waiting_javascript_commands.pop(msg['request_id'], None)
+        if future is not None and not future.done():
+            future.set_result(msg['result'])
 
     async def run_javascript(self, code: str, *,
                              respond: bool = True, timeout: float = 1.0, check_interval: float = 0.01) -> Optional[Any]:
@@ -129,21 +287,25 @@ class Client:
         The client connection must be established before this method is called.
         You can do this by `await client.connected()` or register a callback with `client.on_connect(...)`.
         If respond is True, the javascript code must return a string.
+        The `check_interval` is not used anymore, because the response is passed directly to the waiting call.
         """
         request_id = str(uuid.uuid4())
         command = {
             'code': code,
             'request_id': request_id if respond else None,
         }
+        if respond:
+            future = asyncio.get_running_loop().create_future()
+            self.waiting_javascript_commands[request_id] = future
         outbox.enqueue_message('run_javascript', command, self.id)
         if not respond:
             return None
-        deadline = time.time() + timeout
-        while request_id not in self.waiting_javascript_commands:
-            if time.time() > deadline:
-                raise TimeoutError('JavaScript did not respond in time')
-            await asyncio.sleep(check_interval)
-        return self.waiting_javascript_commands.pop(request_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError('JavaScript did not respond in time') from None
+        finally:
+            self.waiting_javascript_commands.pop(request_id, None)
 
     def open(self, target: Union[Callable[..., Any], str], new_tab: bool = False) -> None:
         """Open a new page in the client."""
@@ -161,3 +323,20 @@ class Client:
     def on_disconnect(self, handler: Union[Callable[..., Any], Awaitable]) -> None:
         """Register a callback to be called when the client disconnects."""
         self.disconnect_handlers.append(handler)
+
+
+async def _wait(waiters: List[asyncio.Future], timeout: Optional[float]) -> None:
+    future = asyncio.get_running_loop().create_future()
+    waiters.append(future)
+    try:
+        await asyncio.wait_for(future, timeout)
+    finally:
+        if future in waiters:
+            waiters.remove(future)
+
+
+def _resolve(waiters: List[asyncio.Future]) -> None:
+    for future in waiters:
+        if not future.done():
+            future.set_result(None)
+    waiters.clear()
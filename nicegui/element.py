@@ -2,15 +2,16 @@ from __future__ import annotations
 
 import inspect
 import re
-from copy import copy, deepcopy
+from copy import copy
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from typing_extensions import Self
 
 from nicegui import json
 
-from . import binding, events, globals, outbox, storage  # pylint: disable=redefined-builtin
+from . import arrays, binding, events, globals, outbox, storage  # pylint: disable=redefined-builtin
 from .dependencies import JsComponent, Library, register_library, register_vue_component
 from .elements.mixins.visibility import Visibility
 from .event_listener import EventListener
@@ -21,13 +22,48 @@ if TYPE_CHECKING:
     from .client import Client
 
 PROPS_PATTERN = re.compile(r'([:\w\-]+)(?:=(?:("[^"\\]*(?:\\.[^"\\]*)*")|([\w\-.%:\/]+)))?(?:$|\s)')
+PARSE_CACHE_SIZE = 1000  # NOTE: props, classes and style strings are mostly literals which are parsed over and over
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _split_classes(text: Optional[str]) -> Tuple[str, ...]:
+    return tuple((text or '').split())
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_style_items(text: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    items = []
+    for word in (text or '').split(';'):
+        word = word.strip()
+        if word:
+            key, value = word.split(':', 1)
+            items.append((key.strip(), value.strip()))
+    return tuple(items)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_props_items(text: Optional[str]) -> Tuple[Tuple[str, Any], ...]:
+    items = []
+    for match in PROPS_PATTERN.finditer(text or ''):
+        key = match.group(1)
+        value = match.group(2) or match.group(3)
+        if value and value.startswith('"') and value.endswith('"'):
+            value = json.loads(value)
+        items.append((key, value or True))
+    return tuple(items)
 
 
 class Element(Visibility):
+    # NOTE: the common attributes are stored in slots; the `__dict__` holds bindable properties and those of subclasses
+    __slots__ = ('client', 'id', 'tag', '_classes', '_style', '_props', '_event_listeners', '_text',
+                 '_synced_state', '_encoded', '_json', '_json_bytes', 'slots', '_default_slot', 'parent_slot',
+                 '__dict__')
     component: Optional[JsComponent] = None
     libraries: List[Library] = []
     extra_libraries: List[Library] = []
     exposed_libraries: List[Library] = []
+    binary_arrays = False  # NOTE: whether NumPy arrays in props and method arguments are sent as typed arrays
+    _key: Any = None  # NOTE: set with `keyed`, stored in the instance dictionary only when used
 
     def __init__(self, tag: Optional[str] = None, *, _client: Optional[Client] = None) -> None:
         """Generic Element
@@ -48,17 +84,20 @@ class Element(Visibility):
         self._props: Dict[str, Any] = {'key': self.id}  # HACK: workaround for #600 and #898
         self._event_listeners: Dict[str, EventListener] = {}
         self._text: Optional[str] = None
+        self._synced_state: Optional[Dict[str, Any]] = None
+        self._encoded: Optional[Dict[str, Any]] = None  # NOTE: JSON of each field and prop, reset whenever changed
+        self._json: Optional[str] = None
+        self._json_bytes = 0  # NOTE: size of the last encoding, kept when the cache is reset
         self.slots: Dict[str, Slot] = {}
-        self.default_slot = self.add_slot('default')
+        self._default_slot: Optional[Slot] = None  # NOTE: created on first use, most elements have no children
 
         self.client.elements[self.id] = self
         self.parent_slot: Optional[Slot] = None
         slot_stack = globals.get_slot_stack()
-        if slot_stack:
+        if slot_stack and slot_stack[-1].parent.client is self.client:
             self.parent_slot = slot_stack[-1]
             self.parent_slot.children.append(self)
-
-        self.tailwind = Tailwind(self)
+            self.parent_slot.parent._invalidate()  # pylint: disable=protected-access
 
         outbox.enqueue_update(self)
         if self.parent_slot:
@@ -96,6 +135,18 @@ class Element(Visibility):
             for path in glob_absolute_paths(library):
                 cls.exposed_libraries.append(register_library(path, expose=True))
 
+    @property
+    def default_slot(self) -> Slot:
+        """The default slot of the element, which contains its children."""
+        if self._default_slot is None:
+            self._default_slot = self.add_slot('default')
+        return self._default_slot
+
+    @property
+    def tailwind(self) -> Tailwind:
+        """Tailwind helper for adding classes to the element."""
+        return Tailwind(self)
+
     def add_slot(self, name: str, template: Optional[str] = None) -> Slot:
         """Add a slot to the element.
 
@@ -119,10 +170,12 @@ class Element(Visibility):
                 yield child
 
     def _collect_slot_dict(self) -> Dict[str, Any]:
-        return {
+        slots = {} if 'default' in self.slots else {'default': {'template': None, 'ids': []}}
+        slots.update({
             name: {'template': slot.template, 'ids': [child.id for child in slot]}
             for name, slot in self.slots.items()
-        }
+        })
+        return slots
 
     def _to_dict(self) -> Dict[str, Any]:
         return {
@@ -147,14 +200,86 @@ class Element(Visibility):
             ],
         }
 
+    def _encode(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Encode the element data field by field and prop by prop.
+
+        The encoding is kept until the element changes, so unchanged elements are not serialized again.
+
+        :param data: element data as returned by `_to_dict` (computed if needed and not given)
+        :return: JSON strings of all fields and of all props
+        """
+        if self._encoded is None:
+            if data is None:
+                data = self._to_dict()
+            encoded: Dict[str, Any] = {key: outbox.dumps(value) for key, value in data.items() if key != 'props'}
+            encoded['props'] = {key: outbox.dumps(value) for key, value in data['props'].items()}
+            self._encoded = encoded
+        return self._encoded
+
+    def _to_json(self) -> str:
+        """Return the element data as JSON string which is assembled from the cached field encodings."""
+        if self._json is None and self._encoded is None and outbox.encoding_cache is None:
+            self._json = json.dumps(self._to_dict())  # NOTE: field encodings are only needed for patches while flushing
+        if self._json is None:
+            encoded = self._encode()
+            props = ','.join(f'{json.dumps(key)}:{value}' for key, value in encoded['props'].items())
+            self._json = '{' + ','.join(
+                f'"{key}":{{{props}}}' if key == 'props' else f'"{key}":{value}' for key, value in encoded.items()
+            ) + '}'
+        if len(self._json) != self._json_bytes:
+            self.client.prop_bytes += len(self._json) - self._json_bytes
+            self._json_bytes = len(self._json)
+        return self._json
+
+    def _patch_to_json(self, patch: Dict[str, Any]) -> str:
+        """Assemble the JSON string of a patch returned by `_to_patch` from the cached field encodings."""
+        assert self._encoded is not None
+        parts: List[str] = []
+        for key in patch:
+            if key == 'props':
+                props = ','.join(f'{json.dumps(name)}:{self._encoded["props"][name]}' for name in patch['props'])
+                parts.append(f'"props":{{{props}}}')
+            elif key == 'removed_props':
+                parts.append(f'"removed_props":{json.dumps(patch[key])}')
+            else:
+                parts.append(f'"{key}":{self._encoded[key]}')
+        return '{' + ','.join(parts) + '}'
+
+    def _invalidate(self) -> None:
+        """Discard the cached encoding so that the element data is serialized again."""
+        self._encoded = None
+        self._json = None
+
+    def _to_patch(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Compare element data with the state that has last been sent to the client and remember the new state.
+
+        :param data: element data as returned by `_to_dict`
+        :return: changed fields and props (`None` if the client has not received the element yet)
+        """
+        self._invalidate()  # NOTE: the given data is authoritative, it is encoded once for the patch and the cache
+        state = self._encode(data)
+        previous, self._synced_state = self._synced_state, state
+        if previous is None:
+            return None
+        patch = {key: data[key] for key, value in state.items() if key != 'props' and previous[key] != value}
+        changed_props = {key: data['props'][key] for key, value in state['props'].items()
+                         if previous['props'].get(key) != value}
+        removed_props = [key for key in previous['props'] if key not in state['props']]
+        if changed_props:
+            patch['props'] = changed_props
+        if removed_props:
+            patch['removed_props'] = removed_props
+        return patch
+
     @staticmethod
     def _update_classes_list(
             classes: List[str],
             add: Optional[str] = None, remove: Optional[str] = None, replace: Optional[str] = None) -> List[str]:
         class_list = classes if replace is None else []
-        class_list = [c for c in class_list if c not in (remove or '').split()]
-        class_list += (add or '').split()
-        class_list += (replace or '').split()
+        if remove:
+            removed = _split_classes(remove)
+            class_list = [c for c in class_list if c not in removed]
+        class_list = [*class_list, *_split_classes(add), *_split_classes(replace)]
         return list(dict.fromkeys(class_list))  # NOTE: remove duplicates while preserving order
 
     def classes(self, add: Optional[str] = None, *, remove: Optional[str] = None, replace: Optional[str] = None) \
@@ -177,13 +302,7 @@ class Element(Visibility):
 
     @staticmethod
     def _parse_style(text: Optional[str]) -> Dict[str, str]:
-        result = {}
-        for word in (text or '').split(';'):
-            word = word.strip()
-            if word:
-                key, value = word.split(':', 1)
-                result[key.strip()] = value.strip()
-        return result
+        return dict(_parse_style_items(text))
 
     def style(self, add: Optional[str] = None, *, remove: Optional[str] = None, replace: Optional[str] = None) -> Self:
         """Apply, remove, or replace CSS definitions.
@@ -194,7 +313,7 @@ class Element(Visibility):
         :param remove: semicolon-separated list of styles to remove from the element
         :param replace: semicolon-separated list of styles to use instead of existing ones
         """
-        style_dict = deepcopy(self._style) if replace is None else {}
+        style_dict = dict(self._style) if replace is None else {}
         for key in self._parse_style(remove):
             style_dict.pop(key, None)
         style_dict.update(self._parse_style(add))
@@ -206,14 +325,7 @@ class Element(Visibility):
 
     @staticmethod
     def _parse_props(text: Optional[str]) -> Dict[str, Any]:
-        dictionary = {}
-        for match in PROPS_PATTERN.finditer(text or ''):
-            key = match.group(1)
-            value = match.group(2) or match.group(3)
-            if value and value.startswith('"') and value.endswith('"'):
-                value = json.loads(value)
-            dictionary[key] = value or True
-        return dictionary
+        return dict(_parse_props_items(text))
 
     def props(self, add: Optional[str] = None, *, remove: Optional[str] = None) -> Self:
         """Add or remove props.
@@ -239,6 +351,36 @@ class Element(Visibility):
             self.update()
         return self
 
+    def keyed(self, key: Any) -> Self:
+        """Identify the element across refreshes of a `ui.refreshable`.
+
+        When the refreshable is refreshed, a new element of the same type and key takes the place of this one,
+        so that only its changes are sent to the browser.
+
+        :param key: hashable value which is unique among the siblings of the element
+        """
+        self._key = key
+        return self
+
+    def _take_over(self, predecessor: Element) -> None:
+        """Take over the ID and the synced state of an element which is replaced by this one."""
+        outbox.update_queue.get(self.client.id, {}).pop(self.id, None)
+        if self._synced_state is not None:
+            outbox.enqueue_forget(self)  # NOTE: it has already been sent with its own ID (e.g. by an async builder)
+        del self.client.elements[self.id]
+        if self._props.get('key') == self.id:
+            self._props['key'] = predecessor.id
+        self.id = predecessor.id
+        self.client.elements[self.id] = self
+        for listener in self._event_listeners.values():
+            listener.element_id = self.id
+        self._synced_state = predecessor._synced_state
+        self._invalidate()
+        outbox.enqueue_update(self)
+        if self.parent_slot:
+            self.parent_slot.parent._invalidate()  # pylint: disable=protected-access
+            outbox.enqueue_update(self.parent_slot.parent)
+
     def tooltip(self, text: str) -> Self:
         """Add a tooltip to the element.
 
@@ -275,7 +417,7 @@ class Element(Visibility):
                 throttle=throttle,
                 leading_events=leading_events,
                 trailing_events=trailing_events,
-                request=storage.request_contextvar.get(),
+                request=storage.get_session_reference(),
             )
             self._event_listeners[listener.id] = listener
             self.update()
@@ -289,6 +431,7 @@ class Element(Visibility):
 
     def update(self) -> None:
         """Update the element on the client side."""
+        self._invalidate()
         outbox.enqueue_update(self)
 
     def run_method(self, name: str, *args: Any) -> None:
@@ -301,21 +444,34 @@ class Element(Visibility):
             return
         data = {'id': self.id, 'name': name, 'args': args}
         target_id = globals._socket_id or self.client.id  # pylint: disable=protected-access
-        outbox.enqueue_message('run_method', data, target_id)
-
-    def _collect_descendant_ids(self) -> List[int]:
-        ids: List[int] = [self.id]
-        for child in self:
-            ids.extend(child._collect_descendant_ids())  # pylint: disable=protected-access
-        return ids
+        binary_data = arrays.encode(data) if self.binary_arrays else None
+        outbox.enqueue_message('run_method', data, target_id, binary_data if binary_data is not data else None)
+
+    def _collect_descendants(self, *, include_self: bool = False) -> List[Element]:
+        descendants: List[Element] = [self] if include_self else []
+        stack = list(self)[::-1]
+        while stack:  # NOTE: depth-first without recursion to support deeply nested elements
+            element = stack.pop()
+            descendants.append(element)
+            stack.extend(list(element)[::-1])
+        return descendants
+
+    def _delete_subtrees(self, children: List[Element]) -> None:
+        """Clean up the given children and all their descendants.
+
+        The browser removes each subtree by its root, so only one delete is queued per child.
+        """
+        elements = [element for child in children for element in child._collect_descendants(include_self=True)]
+        binding.remove(elements, Element)
+        for element in elements:
+            element.delete()
+            del self.client.elements[element.id]
+        for child in children:
+            outbox.enqueue_delete(child)
 
     def clear(self) -> None:
         """Remove all child elements."""
-        descendants = [self.client.elements[id] for id in self._collect_descendant_ids()[1:]]
-        binding.remove(descendants, Element)
-        for element in descendants:
-            element.delete()
-            del self.client.elements[element.id]
+        self._delete_subtrees(list(self))
         for slot in self.slots.values():
             slot.children.clear()
         self.update()
@@ -341,15 +497,26 @@ class Element(Visibility):
         :param element: either the element instance or its ID
         """
         if isinstance(element, int):
-            children = list(self)
-            element = children[element]
-        binding.remove([element], Element)
-        element.delete()
-        del self.client.elements[element.id]
+            element = self._get_child(element)
+        assert element.parent_slot is not None
+        self._delete_subtrees([element])
+        element.parent_slot.children.remove(element)
+        element.parent_slot.parent.update()
+
+    def _get_child(self, index: int) -> Element:
+        """Get the child at the given position of the children of all slots without listing them."""
+        if index < 0:
+            index += sum(len(slot.children) for slot in self.slots.values())
         for slot in self.slots.values():
-            slot.children[:] = [e for e in slot if e.id != element.id]
-        self.update()
+            if 0 <= index < len(slot.children):
+                return slot.children[index]
+            index -= len(slot.children)
+        raise IndexError('child index out of range')
 
     def delete(self) -> None:
-        """Perform cleanup when the element is deleted."""
-        outbox.enqueue_delete(self)
+        """Perform cleanup when the element is deleted.
+
+        The browser is notified by the parent element, which removes the whole subtree at once.
+        """
+        self.client.prop_bytes -= self._json_bytes
+        self._json_bytes = 0
@@ -18,6 +18,26 @@ export default {
         }
       }
       convertDynamicProperties(this.gridOptions, true);
+      if (this.row_key && !this.gridOptions.getRowId) {
+        this.gridOptions.getRowId = (params) => String(params.data[this.row_key]);
+      }
+
+      if (this.server_side) {
+        this.pendingRequests = new Map();
+        this.gridOptions.datasource = {
+          getRows: (params) => {
+            const request_id = this.nextRequestId = (this.nextRequestId || 0) + 1;
+            this.pendingRequests.set(request_id, params);
+            this.$emit("get_rows", {
+              request_id,
+              startRow: params.startRow,
+              endRow: params.endRow,
+              sortModel: params.sortModel,
+              filterModel: params.filterModel,
+            });
+          },
+        };
+      }
 
       // Code for CheckboxRenderer https://blog.ag-grid.com/binding-boolean-values-to-checkboxes-in-ag-grid/
       function CheckboxRenderer() {}
@@ -53,6 +73,21 @@ export default {
     call_column_api_method(name, ...args) {
       this.gridOptions.columnApi[name](...args);
     },
+    apply_transaction({ add, update, remove }) {
+      this.gridOptions.api.applyTransactionAsync({
+        add: add.filter((row) => row !== null),
+        update: update.filter((row) => row !== null),
+        remove,
+      });
+    },
+    provide_rows(request_id, rows, lastRow) {
+      this.pendingRequests.get(request_id)?.successCallback(rows, lastRow);
+      this.pendingRequests.delete(request_id);
+    },
+    fail_rows(request_id) {
+      this.pendingRequests.get(request_id)?.failCallback();
+      this.pendingRequests.delete(request_id);
+    },
     handle_event(type, args) {
       this.$emit(type, {
         value: args.value,
@@ -92,5 +127,7 @@ export default {
     options: Object,
     html_columns: Array,
     auto_size_columns: Boolean,
+    server_side: Boolean,
+    row_key: String,
   },
 };
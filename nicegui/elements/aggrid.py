@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, cast
+import functools
+import operator
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union, cast
 
-from .. import globals
+from .. import globals, json, outbox
 from ..element import Element
+from ..events import GenericEventArguments
 from ..functions.javascript import run_javascript
+from ..helpers import KWONLY_SLOTS
 
 try:
     import pandas as pd
@@ -13,6 +19,99 @@ except ImportError:
     pass
 
 
+@dataclass(**KWONLY_SLOTS)
+class AgGridRequest:
+    start_row: int
+    end_row: int
+    sort_model: List[Dict]
+    filter_model: Dict[str, Dict]
+
+
+AgGridResult = Tuple[List[Dict], Optional[int]]
+
+
+class AgGridDataSource(ABC):
+    """Source of the rows of an AG Grid using the infinite row model"""
+
+    @abstractmethod
+    def fetch(self, request: AgGridRequest) -> Union[AgGridResult, Awaitable[AgGridResult]]:
+        """Return the requested block of rows and the total number of rows (`None` if unknown).
+
+        The method may be a coroutine function, e.g. for querying a database.
+        """
+
+
+class DataFrameDataSource(AgGridDataSource):
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        """Data source paging a Pandas DataFrame
+
+        Only the requested blocks are converted to row dictionaries.
+        The sorted and filtered view of the DataFrame is kept until the sort or filter model changes.
+        """
+        self.df = df
+        self._view_key: Optional[str] = None
+        self._view = df
+
+    def fetch(self, request: AgGridRequest) -> AgGridResult:
+        view = self._get_view(request.sort_model, request.filter_model)
+        block = view.iloc[request.start_row:request.end_row]
+        return json.loads(block.to_json(orient='records', date_format='iso')), len(view)
+
+    def _get_view(self, sort_model: List[Dict], filter_model: Dict[str, Dict]) -> pd.DataFrame:
+        key = json.dumps([sort_model, filter_model])
+        if key != self._view_key:
+            view = self.df
+            for column, model in filter_model.items():
+                view = view[self._filter_mask(view[column], model)]
+            if sort_model:
+                view = view.sort_values(by=[model['colId'] for model in sort_model],
+                                        ascending=[model['sort'] == 'asc' for model in sort_model],
+                                        kind='stable')
+            self._view_key, self._view = key, view
+        return self._view
+
+    def _filter_mask(self, values: pd.Series, model: Dict) -> pd.Series:
+        if 'conditions' in model or 'condition1' in model:
+            conditions = model.get('conditions') or [model['condition1'], model['condition2']]
+            combine = operator.and_ if model.get('operator') == 'AND' else operator.or_
+            return functools.reduce(combine, [self._filter_mask(values, condition) for condition in conditions])
+        kind = model['type']
+        if kind == 'blank':
+            return values.isna()
+        if kind == 'notBlank':
+            return values.notna()
+        if model['filterType'] == 'text':
+            values = values.astype(str).str.lower()
+            value, value_to = str(model['filter']).lower(), None
+            if kind == 'contains':
+                return values.str.contains(value, regex=False)
+            if kind == 'notContains':
+                return ~values.str.contains(value, regex=False)
+            if kind == 'startsWith':
+                return values.str.startswith(value)
+            if kind == 'endsWith':
+                return values.str.endswith(value)
+        elif model['filterType'] == 'date':
+            values = pd.to_datetime(values)
+            value, value_to = pd.Timestamp(model['dateFrom']), model.get('dateTo') and pd.Timestamp(model['dateTo'])
+        else:
+            value, value_to = model['filter'], model.get('filterTo')
+        comparisons = {
+            'equals': operator.eq,
+            'notEqual': operator.ne,
+            'lessThan': operator.lt,
+            'lessThanOrEqual': operator.le,
+            'greaterThan': operator.gt,
+            'greaterThanOrEqual': operator.ge,
+        }
+        if kind in comparisons:
+            return comparisons[kind](values, value)
+        if kind == 'inRange':
+            return (values > value) & (values < value_to)
+        raise ValueError(f'unsupported filter "{kind}" of type "{model["filterType"]}"')
+
+
 class AgGrid(Element, component='aggrid.js', libraries=['lib/aggrid/ag-grid-community.min.js']):
 
     def __init__(self,
@@ -20,6 +119,8 @@ class AgGrid(Element, component='aggrid.js', libraries=['lib/aggrid/ag-grid-comm
                  html_columns: List[int] = [],
                  theme: str = 'balham',
                  auto_size_columns: bool = True,
+                 data_source: Optional[Union[AgGridDataSource, Callable[[AgGridRequest], Any]]] = None,
+                 row_key: Optional[str] = None,
                  ) -> None:
         """AG Grid
 
@@ -27,30 +128,59 @@ class AgGrid(Element, component='aggrid.js', libraries=['lib/aggrid/ag-grid-comm
 
         The `call_api_method` method can be used to call an AG Grid API method.
 
+        If a data source is given, the grid uses AG Grid's infinite row model
+        and requests blocks of rows with the current sort and filter model from the server.
+        A data source is either an object derived from `AgGridDataSource` or a (possibly async) function
+        which receives an `AgGridRequest` and returns the rows of the requested block and the total number of rows.
+
         :param options: dictionary of AG Grid options
         :param html_columns: list of columns that should be rendered as HTML (default: `[]`)
         :param theme: AG Grid theme (default: 'balham')
         :param auto_size_columns: whether to automatically resize columns to fit the grid width (default: `True`)
+        :param data_source: data source for the infinite row model (default: `None`)
+        :param row_key: name of the field identifying rows, needed for `add_rows`, `update_rows` and `remove_rows`
+                        (default: `None`)
         """
         super().__init__()
         self._props['options'] = options
         self._props['html_columns'] = html_columns
         self._props['auto_size_columns'] = auto_size_columns
+        self._props['server_side'] = data_source is not None
+        self._props['row_key'] = row_key
         self._classes = ['nicegui-aggrid', f'ag-theme-{theme}']
+        self.row_key = row_key
+        self._row_positions: Dict[Any, int] = {}
+        self._transaction: Dict[str, List[Optional[Dict]]] = {}
+        self._transaction_positions: Dict[str, Dict[Any, int]] = {}
+        self._transaction_flush = -1
+
+        if data_source is not None:
+            options.setdefault('rowModelType', 'infinite')
+            self._fetch = data_source.fetch if isinstance(data_source, AgGridDataSource) else data_source
+            self.on('get_rows', self._handle_get_rows, ['request_id', 'startRow', 'endRow', 'sortModel', 'filterModel'])
 
     @staticmethod
     def from_pandas(df: pd.DataFrame, *,
                     theme: str = 'balham',
                     auto_size_columns: bool = True,
-                    options: Dict = {}) -> AgGrid:
+                    options: Dict = {},
+                    server_side: bool = False) -> AgGrid:
         """Create an AG Grid from a Pandas DataFrame.
 
         :param df: Pandas DataFrame
         :param theme: AG Grid theme (default: 'balham')
         :param auto_size_columns: whether to automatically resize columns to fit the grid width (default: `True`)
         :param options: dictionary of additional AG Grid options
+        :param server_side: whether to serve blocks of rows from the DataFrame instead of sending all rows
+                            (default: `False`)
         :return: AG Grid element
         """
+        if server_side:
+            return AgGrid({
+                'columnDefs': [{'field': col} for col in df.columns],
+                'suppressDotNotation': True,
+                **options,
+            }, theme=theme, auto_size_columns=auto_size_columns, data_source=DataFrameDataSource(df))
         return AgGrid({
             'columnDefs': [{'field': col} for col in df.columns],
             'rowData': df.to_dict('records'),
@@ -58,6 +188,106 @@ class AgGrid(Element, component='aggrid.js', libraries=['lib/aggrid/ag-grid-comm
             **options,
         }, theme=theme, auto_size_columns=auto_size_columns)
 
+    async def _handle_get_rows(self, e: GenericEventArguments) -> None:
+        request = AgGridRequest(start_row=e.args['startRow'],
+                                end_row=e.args['endRow'],
+                                sort_model=e.args.get('sortModel') or [],
+                                filter_model=e.args.get('filterModel') or {})
+        try:
+            result = self._fetch(request)
+            if isinstance(result, Awaitable):
+                result = await result
+        except Exception:
+            self.run_method('fail_rows', e.args['request_id'])
+            raise
+        rows, row_count = result
+        self.run_method('provide_rows', e.args['request_id'], rows, -1 if row_count is None else row_count)
+
+    def add_rows(self, *rows: Dict) -> None:
+        """Add rows to the grid.
+
+        Only the new rows are sent to the client, which adds them with AG Grid's `applyTransactionAsync`.
+        Calls within the same update cycle are combined into a single transaction.
+        This requires a `row_key` and AG Grid's client-side row model.
+        """
+        row_data = self.options.setdefault('rowData', [])
+        for row in rows:
+            self._row_positions[row[self._get_row_key()]] = len(row_data)
+            row_data.append(row)
+            self._add_to_transaction('add', row)
+
+    def update_rows(self, *rows: Dict) -> None:
+        """Replace rows of the grid which have the same row key as the given rows (see `add_rows`)."""
+        row_data = self.options.setdefault('rowData', [])
+        for row in rows:
+            position = self._find_row(row[self._get_row_key()])
+            if position is not None:
+                row_data[position] = row
+                self._add_to_transaction('update', row)
+
+    def remove_rows(self, *rows: Dict) -> None:
+        """Remove rows from the grid which have the same row key as the given rows (see `add_rows`)."""
+        row_key = self._get_row_key()
+        keys = {row[row_key] for row in rows}
+        row_data = self.options.setdefault('rowData', [])
+        row_data[:] = [row for row in row_data if row[row_key] not in keys]
+        self._row_positions.clear()
+        for key in keys:
+            self._add_to_transaction('remove', {row_key: key})
+
+    def _get_row_key(self) -> str:
+        if self.row_key is None:
+            raise ValueError('a row_key is needed to add, update or remove individual rows')
+        return self.row_key
+
+    def _find_row(self, key: Any) -> Optional[int]:
+        """Find the position of a row in the row data, rebuilding the index if it is outdated."""
+        row_data = self.options.get('rowData', [])
+        position = self._row_positions.get(key)
+        if position is not None and position < len(row_data) and row_data[position][self.row_key] == key:
+            return position
+        self._row_positions = {row[self.row_key]: i for i, row in enumerate(row_data)}
+        return self._row_positions.get(key)
+
+    def _add_to_transaction(self, kind: str, row: Dict) -> None:
+        """Add a row to the transaction which is sent with the next flush of the outbox.
+
+        AG Grid applies removals before updates and additions,
+        so pending additions and updates are amended or dropped to keep the order of the calls.
+        """
+        self._invalidate()  # NOTE: the row data has changed in place, so the cached options are outdated
+        if self.id in outbox.update_queue.get(self.client.id, {}):
+            return  # NOTE: the client receives all rows with the pending update anyway
+        if self._synced_state is None:
+            self.update()
+            return
+        if self._transaction_flush != outbox.flush_count:
+            self._transaction = {'add': [], 'update': [], 'remove': []}
+            self._transaction_positions = {'add': {}, 'update': {}, 'remove': {}}
+            self._transaction_flush = outbox.flush_count
+            self.run_method('apply_transaction', self._transaction)
+        key = row[self.row_key]
+        positions = self._transaction_positions
+        if kind == 'update' and key in positions['add']:
+            kind = 'add'
+        if kind == 'remove':
+            only_added = key in positions['add'] and key not in positions['remove']
+            for pending in ['add', 'update']:
+                if key in positions[pending]:
+                    self._transaction[pending][positions[pending].pop(key)] = None
+            if not only_added and key not in positions['remove']:
+                positions['remove'][key] = len(self._transaction['remove'])
+                self._transaction['remove'].append(row)
+        elif key in positions[kind]:
+            self._transaction[kind][positions[kind][key]] = row
+        else:
+            positions[kind][key] = len(self._transaction[kind])
+            self._transaction[kind].append(row)
+
+    def refresh_rows(self) -> None:
+        """Request all loaded blocks of rows again from the data source (only with a data source)."""
+        self.call_api_method('refreshInfiniteCache')
+
     @property
     def options(self) -> Dict:
         return self._props['options']
@@ -1,3 +1,10 @@
+function convertTypedArrays(options) {
+  // NOTE: Highcharts expects plain arrays as series data
+  for (const series of options.series ?? []) {
+    if (ArrayBuffer.isView(series.data)) series.data = Array.from(series.data);
+  }
+}
+
 export default {
   template: "<div></div>",
   mounted() {
@@ -25,6 +32,7 @@ export default {
         this.options.plotOptions.series.point.events.dragStart = (e) => this.$emit("pointDragStart", uncycle(e));
         this.options.plotOptions.series.point.events.drag = (e) => this.$emit("pointDrag", uncycle(e));
         this.options.plotOptions.series.point.events.drop = (e) => this.$emit("pointDrop", uncycle(e));
+        convertTypedArrays(this.options);
         this.chart = Highcharts[this.type](this.$el, this.options);
         this.chart.reflow();
       });
@@ -47,6 +55,7 @@ export default {
           this.chart.addSeries({}, false);
           this.seriesCount++;
         }
+        convertTypedArrays(this.options);
         this.chart.update(this.options);
       }
     },
@@ -9,6 +9,7 @@ class Chart(Element,
             component='chart.js',
             libraries=['lib/highcharts/*.js'],
             extra_libraries=['lib/highcharts/modules/*.js']):
+    binary_arrays = True
 
     def __init__(self, options: Dict, *,
                  type: str = 'chart', extras: List[str] = [],
@@ -1,7 +1,17 @@
+function convertTypedArrays(obj) {
+  // NOTE: ECharts reads a typed array as flat records of all dimensions, so NumPy arrays need to be plain arrays
+  for (const key in obj) {
+    const value = obj[key];
+    if (ArrayBuffer.isView(value)) obj[key] = Array.from(value);
+    else if (typeof value === "object" && value !== null) convertTypedArrays(value);
+  }
+}
+
 export default {
   template: "<div></div>",
   mounted() {
     this.chart = echarts.init(this.$el);
+    convertTypedArrays(this.options);
     this.chart.setOption(this.options);
     this.chart.resize();
   },
@@ -14,6 +24,7 @@ export default {
   methods: {
     update_chart() {
       if (this.chart) {
+        convertTypedArrays(this.options);
         this.chart.setOption(this.options);
       }
     },
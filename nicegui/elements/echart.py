@@ -4,6 +4,7 @@ from ..element import Element
 
 
 class EChart(Element, component='echart.js', libraries=['lib/echarts/echarts.min.js']):
+    binary_arrays = True
 
     def __init__(self, options: Dict) -> None:
         """Apache EChart
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
 
 class Visibility:
+    __slots__ = ('ignores_events_when_hidden',)
     visible = BindableProperty(on_change=lambda sender, visible: sender.on_visibility_change(visible))
 
     def __init__(self, **kwargs: Any) -> None:
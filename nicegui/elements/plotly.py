@@ -13,6 +13,7 @@ except ImportError:
 
 
 class Plotly(Element, component='plotly.vue', libraries=['lib/plotly/plotly.min.js']):
+    binary_arrays = True
 
     def __init__(self, figure: Union[Dict, go.Figure]) -> None:
         """Plotly Element
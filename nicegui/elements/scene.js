@@ -238,8 +238,9 @@ export default {
         mesh.add(light.target);
       } else if (type == "point_cloud") {
         const geometry = new THREE.BufferGeometry();
-        geometry.setAttribute("position", new THREE.Float32BufferAttribute(args[0].flat(), 3));
-        geometry.setAttribute("color", new THREE.Float32BufferAttribute(args[1].flat(), 3));
+        const flat = (array) => (ArrayBuffer.isView(array) ? array : array.flat());
+        geometry.setAttribute("position", new THREE.Float32BufferAttribute(flat(args[0]), 3));
+        geometry.setAttribute("color", new THREE.Float32BufferAttribute(flat(args[1]), 3));
         const material = new THREE.PointsMaterial({ size: args[2], vertexColors: true });
         mesh = new THREE.Points(geometry, material);
       } else {
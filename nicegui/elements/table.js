@@ -1,10 +1,13 @@
 import { convertDynamicProperties } from "../../static/utils/dynamic_properties.js";
 
+const rowIndices = new WeakMap();
+
 export default {
   template: `
     <q-table
       ref="qRef"
       v-bind="$attrs"
+      v-on="server_side ? { 'update:pagination': () => {} } : {}"
       :columns="convertedColumns"
     >
       <template v-for="(_, slot) in $slots" v-slot:[slot]="slotProps">
@@ -14,6 +17,12 @@ export default {
   `,
   props: {
     columns: Array,
+    server_side: Boolean,
+  },
+  mounted() {
+    if (this.server_side && this.$attrs.pagination.rowsNumber === undefined) {
+      this.$refs.qRef.requestServerInteraction();
+    }
   },
   computed: {
     convertedColumns() {
@@ -21,4 +30,40 @@ export default {
       return this.columns;
     },
   },
+  methods: {
+    requestServerInteraction() {
+      this.$refs.qRef.requestServerInteraction();
+    },
+    apply_row_transaction({ add, update, remove }) {
+      const rows = this.$attrs.rows;
+      const rowKey = this.$attrs["row-key"];
+      if (remove.length) {
+        const keys = new Set(remove);
+        const keep = (row) => !keys.has(row[rowKey]);
+        let length = 0;
+        rows.forEach((row) => keep(row) && (rows[length++] = row));
+        rows.length = length;
+        const selected = this.$attrs.selected;
+        if (selected) selected.splice(0, selected.length, ...selected.filter(keep));
+      }
+      const index = this.rowIndex(rows, rowKey, remove.length > 0);
+      for (const row of [...update, ...add]) {
+        const i = index.get(row[rowKey]);
+        if (i !== undefined) {
+          rows[i] = row;
+        } else if (add.includes(row)) {
+          index.set(row[rowKey], rows.length);
+          rows.push(row);
+        }
+      }
+    },
+    rowIndex(rows, rowKey, force) {
+      // NOTE: the index stays valid as long as rows are only replaced or appended by transactions
+      const cached = rowIndices.get(rows);
+      if (!force && cached && cached.rowKey === rowKey) return cached.index;
+      const index = new Map(rows.map((row, i) => [row[rowKey], i]));
+      rowIndices.set(rows, { rowKey, index });
+      return index;
+    },
+  },
 };
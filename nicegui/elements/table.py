@@ -1,43 +1,109 @@
-from typing import Any, Callable, Dict, List, Literal, Optional
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple, Union
 
+from .. import outbox
 from ..element import Element
 from ..events import GenericEventArguments, TableSelectionEventArguments, handle_event
+from ..helpers import KWONLY_SLOTS, is_coroutine_function
 from .mixins.filter_element import FilterElement
 
 
+@dataclass(**KWONLY_SLOTS)
+class TableRequest:
+    page: int
+    rows_per_page: int
+    sort_by: Optional[str]
+    descending: bool
+    filter: Optional[str]
+
+    @property
+    def start(self) -> int:
+        """Index of the first requested row."""
+        return (self.page - 1) * self.rows_per_page
+
+    @property
+    def stop(self) -> Optional[int]:
+        """Index after the last requested row (`None` if all rows are requested)."""
+        return self.start + self.rows_per_page if self.rows_per_page else None
+
+
+TableResult = Tuple[List[Dict], int]
+
+
+class TableDataSource(ABC):
+    """Source of the rows of a server-side table"""
+
+    @abstractmethod
+    def fetch(self, request: TableRequest) -> Union[TableResult, Awaitable[TableResult]]:
+        """Return the rows of the requested page and the total number of rows matching the filter.
+
+        The method may be a coroutine function, e.g. for querying a database.
+        """
+
+
+class ListDataSource(TableDataSource):
+
+    def __init__(self, rows: List[Dict], columns: List[Dict]) -> None:
+        """Data source sorting, filtering and slicing a list of rows in Python"""
+        self.rows = rows
+        self.fields = {column['name']: column['field'] for column in columns if isinstance(column.get('field'), str)}
+
+    def fetch(self, request: TableRequest) -> TableResult:
+        rows = self.rows
+        if request.filter:
+            term = request.filter.lower()
+            rows = [row for row in rows
+                    if any(term in str(row.get(field, '')).lower() for field in self.fields.values())]
+        if request.sort_by in self.fields:
+            field = self.fields[request.sort_by]
+            rows = sorted(rows, key=lambda row: (row.get(field) is None, row.get(field)), reverse=request.descending)
+        return rows[request.start:request.stop], len(rows)
+
+
 class Table(FilterElement, component='table.js'):
 
     def __init__(self,
                  columns: List[Dict],
-                 rows: List[Dict],
+                 rows: Union[List[Dict], TableDataSource, Callable[[TableRequest], Any]],
                  row_key: str = 'id',
                  title: Optional[str] = None,
                  selection: Optional[Literal['single', 'multiple']] = None,
                  pagination: Optional[int] = None,
                  on_select: Optional[Callable[..., Any]] = None,
+                 server_side: bool = False,
                  ) -> None:
         """Table
 
         A table based on Quasar's `QTable <https://quasar.dev/vue-components/table>`_ component.
 
         :param columns: list of column objects
-        :param rows: list of row objects
+        :param rows: list of row objects, a `TableDataSource` or a function returning the rows of a `TableRequest`
         :param row_key: name of the column containing unique data identifying the row (default: "id")
         :param title: title of the table
         :param selection: selection type ("single" or "multiple"; default: `None`)
         :param pagination: number of rows per page (`None` hides the pagination, 0 means "infinite"; default: `None`)
         :param on_select: callback which is invoked when the selection changes
+        :param server_side: whether to paginate, sort and filter the rows on the server (default: `False`)
 
         If selection is 'single' or 'multiple', then a `selected` property is accessible containing the selected rows.
+
+        In server-side mode only the rows of the current page are sent to the browser.
+        They are fetched from a data source whenever the page, the sorting or the filter changes.
+        A data source is either an object derived from `TableDataSource` or a (possibly async) function
+        which receives a `TableRequest` and returns the rows of the requested page and the total number of rows.
+        A plain list of rows is paginated, sorted and filtered in Python.
+        Data sources other than lists imply server-side mode.
         """
         super().__init__()
 
-        self.rows = rows
+        self.rows = rows if isinstance(rows, list) else []
         self.row_key = row_key
         self.selected: List[Dict] = []
+        self.server_side = server_side or not isinstance(rows, list)
 
         self._props['columns'] = columns
-        self._props['rows'] = rows
+        self._props['rows'] = rows if not self.server_side else []
         self._props['row-key'] = row_key
         self._props['title'] = title
         self._props['hide-pagination'] = pagination is None
@@ -45,6 +111,7 @@ class Table(FilterElement, component='table.js'):
         self._props['selection'] = selection or 'none'
         self._props['selected'] = self.selected
         self._props['fullscreen'] = False
+        self._props['server_side'] = self.server_side
 
         def handle_selection(e: GenericEventArguments) -> None:
             if e.args['added']:
@@ -58,6 +125,48 @@ class Table(FilterElement, component='table.js'):
             handle_event(on_select, arguments)
         self.on('selection', handle_selection, ['added', 'rows', 'keys'])
 
+        if self.server_side:
+            if isinstance(rows, list):
+                rows = ListDataSource(rows, columns)
+            self._fetch = rows.fetch if isinstance(rows, TableDataSource) else rows
+            if not is_coroutine_function(self._fetch):
+                request = TableRequest(page=1, rows_per_page=pagination or 0, sort_by=None, descending=False,
+                                       filter=self.filter)
+                self._show_page(request, *self._fetch(request))  # NOTE: otherwise the browser requests the first page
+            self.on('request', self._handle_request, ['pagination', 'filter'])
+
+    async def _handle_request(self, e: GenericEventArguments) -> None:
+        pagination = e.args['pagination']
+        request = TableRequest(page=pagination['page'],
+                               rows_per_page=pagination['rowsPerPage'],
+                               sort_by=pagination.get('sortBy'),
+                               descending=pagination.get('descending', False),
+                               filter=e.args.get('filter') or None)
+        result = self._fetch(request)
+        if isinstance(result, Awaitable):
+            self._props['loading'] = True
+            self.update()
+            try:
+                result = await result
+            finally:
+                self._props['loading'] = False
+        self._show_page(request, *result)
+
+    def _show_page(self, request: TableRequest, rows: List[Dict], rows_number: int) -> None:
+        self._props['rows'] = rows
+        self._props['pagination'] = {
+            'page': request.page,
+            'rowsPerPage': request.rows_per_page,
+            'sortBy': request.sort_by,
+            'descending': request.descending,
+            'rowsNumber': rows_number,
+        }
+        self.update()
+
+    def refresh_rows(self) -> None:
+        """Fetch the current page again from the data source (only in server-side mode)."""
+        self.run_method('requestServerInteraction')
+
     @property
     def is_fullscreen(self) -> bool:
         """Whether the table is in fullscreen mode."""
@@ -80,14 +189,39 @@ class Table(FilterElement, component='table.js'):
     def add_rows(self, *rows: Dict) -> None:
         """Add rows to the table."""
         self.rows.extend(rows)
-        self.update()
+        self._apply_row_transaction(add=list(rows))
 
     def remove_rows(self, *rows: Dict) -> None:
         """Remove rows from the table."""
-        keys = [row[self.row_key] for row in rows]
+        keys = {row[self.row_key] for row in rows}
         self.rows[:] = [row for row in self.rows if row[self.row_key] not in keys]
         self.selected[:] = [row for row in self.selected if row[self.row_key] not in keys]
-        self.update()
+        self._apply_row_transaction(remove=list(keys))
+
+    def update_rows(self, *rows: Dict) -> None:
+        """Replace rows of the table which have the same row key as the given rows."""
+        new_rows = {row[self.row_key]: row for row in rows}
+        self.rows[:] = [new_rows.get(row[self.row_key], row) for row in self.rows]
+        self.selected[:] = [new_rows.get(row[self.row_key], row) for row in self.selected]
+        self._apply_row_transaction(update=list(rows))
+
+    def _apply_row_transaction(self, *,
+                               add: Optional[List[Dict]] = None,
+                               update: Optional[List[Dict]] = None,
+                               remove: Optional[List[Any]] = None) -> None:
+        """Send only the affected rows to the client, which applies them to its rows in place.
+
+        If the client has not received the table yet or a full update is pending anyway,
+        the table is updated as a whole instead.
+        """
+        if self.server_side:
+            self.refresh_rows()
+            return
+        if self._synced_state is None or self.id in outbox.update_queue.get(self.client.id, {}):
+            self.update()
+            return
+        self._invalidate()  # NOTE: the cached JSON still has the old rows, which a reloaded page would show
+        self.run_method('apply_row_transaction', {'add': add or [], 'update': update or [], 'remove': remove or []})
 
     class row(Element):
         def __init__(self) -> None:
@@ -1,15 +1,16 @@
-import uuid
+import itertools
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
-from fastapi import Request
-
 from .helpers import KWONLY_SLOTS
+from .storage import SessionReference
+
+listener_ids = itertools.count()
 
 
 @dataclass(**KWONLY_SLOTS)
 class EventListener:
-    id: str = field(init=False)
+    id: int = field(init=False)
     element_id: int
     type: str
     args: List[Optional[List[str]]]
@@ -17,10 +18,10 @@ class EventListener:
     throttle: float
     leading_events: bool
     trailing_events: bool
-    request: Optional[Request]
+    request: Optional[SessionReference]
 
     def __post_init__(self) -> None:
-        self.id = str(uuid.uuid4())
+        self.id = next(listener_ids)
 
     def to_dict(self) -> Dict[str, Any]:
         words = self.type.split('.')
@@ -1,9 +1,10 @@
+from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+from typing import Any, Awaitable, Callable, DefaultDict, Deque, Dict, List, Tuple, Union
 
 from typing_extensions import Self
 
-from .. import background_tasks, globals
+from .. import background_tasks, binding, globals
 from ..element import Element
 from ..helpers import KWONLY_SLOTS, is_coroutine_function
 
@@ -32,6 +33,69 @@ class RefreshableTarget:
                     func(self.instance, *self.args, **self.kwargs)
             return None  # required by mypy
 
+    def is_keyed(self) -> bool:
+        """Whether the content contains elements with a key (see `Element.keyed`)."""
+        # pylint: disable=protected-access
+        return any(element._key is not None for element in self.container._collect_descendants())
+
+    def detach(self) -> List[Element]:
+        """Remove the content from the container without deleting it."""
+        content = list(self.container)
+        for slot in self.container.slots.values():
+            slot.children.clear()
+        return content
+
+    def reconcile(self, previous: List[Element]) -> None:
+        """Let the new content take over the previous elements of the same type and key and delete the others."""
+        replaced, removed = _reconcile(previous, list(self.container))
+        binding.remove(replaced, Element)
+        for element in replaced:
+            element.delete()
+        self.container._delete_subtrees(removed)  # pylint: disable=protected-access
+        self.container.update()
+
+
+def _identify(elements: List[Element]) -> List[Tuple[Any, ...]]:
+    """Identify elements by their type and key or by their position among the unkeyed siblings of the same type."""
+    positions: DefaultDict[type, int] = defaultdict(int)
+    identities: List[Tuple[Any, ...]] = []
+    for element in elements:
+        key = element._key  # pylint: disable=protected-access
+        if key is None:
+            identities.append((type(element), False, positions[type(element)]))
+            positions[type(element)] += 1
+        else:
+            identities.append((type(element), True, key))
+    return identities
+
+
+def _reconcile(previous: List[Element], current: List[Element]) -> Tuple[List[Element], List[Element]]:
+    """Match the current elements with the previous ones and let them take over their IDs.
+
+    The children of matched elements are reconciled recursively, slot by slot.
+
+    :return: the previous elements which have been replaced and those which have to be deleted with their descendants
+    """
+    candidates: DefaultDict[Tuple[Any, ...], Deque[Element]] = defaultdict(deque)
+    for identity, element in zip(_identify(previous), previous):
+        candidates[identity].append(element)  # NOTE: siblings with the same key are matched in order
+    replaced: List[Element] = []
+    removed: List[Element] = []
+    for identity, element in zip(_identify(current), current):
+        if not candidates.get(identity):
+            continue
+        predecessor = candidates[identity].popleft()
+        element._take_over(predecessor)  # pylint: disable=protected-access
+        replaced.append(predecessor)
+        for name in {**predecessor.slots, **element.slots}:
+            previous_children = list(predecessor.slots[name]) if name in predecessor.slots else []
+            current_children = list(element.slots[name]) if name in element.slots else []
+            slot_replaced, slot_removed = _reconcile(previous_children, current_children)
+            replaced.extend(slot_replaced)
+            removed.extend(slot_removed)
+    removed.extend(element for elements in candidates.values() for element in elements)
+    return replaced, removed
+
 
 class RefreshableContainer(Element, component='refreshable.js'):
     pass
@@ -44,6 +108,8 @@ class refreshable:
 
         The `@ui.refreshable` decorator allows you to create functions that have a `refresh` method.
         This method will automatically delete all elements created by the function and recreate them.
+        Elements marked with `keyed` are matched with the new elements of the same type and key instead,
+        so that only the changes are sent to the browser.
         """
         self.func = func
         self.instance = None
@@ -73,9 +139,12 @@ class refreshable:
         for target in self.targets:
             if target.instance != self.instance:
                 continue
-            target.container.clear()
+            previous = target.detach() if target.is_keyed() else None
+            if previous is None:
+                target.container.clear()
             target.args = args or target.args
             target.kwargs.update(kwargs)
+            result = None
             try:
                 result = target.run(self.func)
             except TypeError as e:
@@ -85,6 +154,11 @@ class refreshable:
                     raise Exception(f'{parameter} needs to be consistently passed to {function} '
                                     'either as positional or as keyword argument') from e
                 raise
+            finally:
+                if previous is not None and result is None:
+                    target.reconcile(previous)
+            if previous is not None and result is not None:
+                result = _reconcile_after(result, target, previous)
             if is_coroutine_function(self.func):
                 assert result is not None
                 if globals.loop and globals.loop.is_running():
@@ -98,3 +172,10 @@ class refreshable:
             for target in self.targets
             if target.container.client.id in globals.clients and target.container.id in target.container.client.elements
         ]
+
+
+async def _reconcile_after(result: Awaitable, target: RefreshableTarget, previous: List[Element]) -> None:
+    try:
+        await result
+    finally:
+        target.reconcile(previous)
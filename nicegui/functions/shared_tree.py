@@ -0,0 +1,70 @@
+import itertools
+from typing import Any, Dict, List
+
+from typing_extensions import Self
+
+from .. import globals  # pylint: disable=redefined-builtin
+from ..client import Client
+from ..element import Element
+from ..page import page
+
+# NOTE: each tree gets its own range of element IDs which does not collide with those of ordinary clients
+ID_RANGE_BITS = 32
+id_ranges = itertools.count(1)
+
+
+class SharedTreeMount(Element):
+
+    def __init__(self, tree: 'shared_tree') -> None:
+        if tree.client.id in globals.get_client().mounted_trees:
+            raise ValueError('A shared tree can only be mounted once per page')
+        super().__init__()
+        self.tree = tree
+        self.client.mounted_trees[tree.client.id] = tree
+        assert tree.client.subscriber_ids is not None
+        tree.client.subscriber_ids.add(self.client.id)
+
+    def _collect_slot_dict(self) -> Dict[str, Any]:
+        return {'default': {'template': None, 'ids': [self.tree.root.id]}}
+
+    def delete(self) -> None:
+        assert self.tree.client.subscriber_ids is not None
+        self.tree.client.subscriber_ids.discard(self.client.id)
+        self.client.mounted_trees.pop(self.tree.client.id, None)
+        super().delete()
+
+
+class shared_tree:
+
+    def __init__(self) -> None:
+        """Shared Tree
+
+        Elements created within a shared tree exist only once but can be mounted into the pages of many clients.
+        Updates are sent to all clients showing the tree and bindings are only evaluated once.
+        This is useful for app-wide widgets like status panels which look the same for every user.
+        Event handlers run in the context of the shared tree,
+        so notifications and new elements are shown to all clients.
+        """
+        self.client = Client(page(''), shared=True)
+        self.client.subscriber_ids = set()
+        self.client.next_element_id = next(id_ranges) << ID_RANGE_BITS
+        with self.client:
+            self.root = Element()
+
+    def __enter__(self) -> Self:
+        self.root.__enter__()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.root.__exit__(*_)
+
+    def mount(self) -> SharedTreeMount:
+        """Show the shared tree at the current position of the page."""
+        return SharedTreeMount(self)
+
+    def elements(self) -> List[Element]:
+        """Return the root element of the tree and all its descendants."""
+        return self.root._collect_descendants(include_self=True)  # pylint: disable=protected-access
+
+    def _to_dict(self) -> Dict[int, Dict[str, Any]]:
+        return {element.id: element._to_dict() for element in self.elements()}  # pylint: disable=protected-access
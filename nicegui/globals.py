@@ -5,9 +5,10 @@ import inspect
 import logging
 import os
 from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterator, List, Literal, Optional, Set, Union
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterator, List, Literal, Optional, Set, Tuple, Union
 
 from socketio import AsyncServer
 from uvicorn import Server
@@ -17,6 +18,7 @@ from . import background_tasks
 if TYPE_CHECKING:
     from .air import Air
     from .app import App
+    from .backend import Backend
     from .client import Client
     from .language import Language
     from .slot import Slot
@@ -45,16 +47,29 @@ favicon: Optional[Union[str, Path]]
 dark: Optional[bool]
 language: Language
 binding_refresh_interval: float
+outbox_coalescing_window: float = 0.0  # time to wait for further updates before flushing the outbox
+outbox_max_latency: float = 0.1  # upper bound for delaying a flush while updates keep coming in
+outbox_max_pending: int = 1000  # messages buffered for a slow client before its state is sent in full again
+outbox_max_queued: int = 20  # packets waiting in a browser's socket before sending to it is paused
+outbox_history_size: int = 100  # frames kept per client to be replayed after a reconnect
+outbox_history_bytes: int = 1_000_000  # approximate size limit of the frames kept per client
+reconnect_timeout: float = 3.0  # time to keep a disconnected client alive for the browser to reconnect
+hibernation_timeout: Optional[float] = None  # idle time after which a client's synced state and caches are released
+max_client_bytes: Optional[int] = None  # approximate memory limit of a single client, larger clients are evicted
+max_total_bytes: Optional[int] = None  # approximate memory limit of all clients, least recently active ones are evicted
+eviction_idle_timeout: float = 600.0  # inactivity after which connected clients can be evicted, too
 tailwind: bool
 prod_js: bool
 endpoint_documentation: Literal['none', 'internal', 'page', 'all'] = 'none'
 air: Optional[Air] = None
+backend: Backend
 storage_path: Path = Path(os.environ.get('NICEGUI_STORAGE_PATH', '.nicegui')).resolve()
 socket_io_js_query_params: Dict = {}
 socket_io_js_extra_headers: Dict = {}
 socket_io_js_transports: List[Literal['websocket', 'polling']] = ['websocket', 'polling']  # NOTE: we favor websocket
 _socket_id: Optional[str] = None
-slot_stacks: Dict[int, List[Slot]] = {}
+# NOTE: the stack is immutable so that child tasks and threads inherit it without affecting their parent's stack
+slot_stack: ContextVar[Tuple[Slot, ...]] = ContextVar('slot_stack', default=())
 clients: Dict[str, Client] = {}
 index_client: Client
 quasar_config: Dict = {
@@ -76,24 +91,16 @@ disconnect_handlers: List[Union[Callable[..., Any], Awaitable]] = []
 exception_handlers: List[Callable[..., Any]] = [log.exception]
 
 
-def get_task_id() -> int:
-    try:
-        return id(asyncio.current_task())
-    except RuntimeError:
-        return 0
+def get_slot_stack() -> Tuple[Slot, ...]:
+    return slot_stack.get()
 
 
-def get_slot_stack() -> List[Slot]:
-    task_id = get_task_id()
-    if task_id not in slot_stacks:
-        slot_stacks[task_id] = []
-    return slot_stacks[task_id]
+def push_slot(slot: Slot) -> None:
+    slot_stack.set(slot_stack.get() + (slot,))
 
 
-def prune_slot_stack() -> None:
-    task_id = get_task_id()
-    if not slot_stacks[task_id]:
-        del slot_stacks[task_id]
+def pop_slot() -> None:
+    slot_stack.set(slot_stack.get()[:-1])
 
 
 def get_slot() -> Slot:
@@ -1,8 +1,9 @@
 import asyncio
+import heapq
 import time
 import urllib.parse
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 from fastapi import HTTPException, Request
 from fastapi.middleware.gzip import GZipMiddleware
@@ -16,7 +17,8 @@ from nicegui.json import NiceGUIJSONResponse
 from . import (__version__, background_tasks, binding, favicon, globals, outbox,  # pylint: disable=redefined-builtin
                welcome)
 from .app import App
-from .client import Client
+from .backend import Backend
+from .client import Client, connection_deadlines
 from .dependencies import js_components, libraries
 from .element import Element
 from .error import error_content
@@ -27,6 +29,7 @@ globals.app = app = App(default_response_class=NiceGUIJSONResponse)
 # NOTE we use custom json module which wraps orjson
 socket_manager = SocketManager(app=app, mount_location='/_nicegui_ws/', json=json)
 globals.sio = sio = socket_manager._sio  # pylint: disable=protected-access
+globals.backend = Backend()
 
 app.add_middleware(GZipMiddleware)
 static_files = StaticFiles(
@@ -87,10 +90,14 @@ def handle_startup(with_welcome_message: bool = True) -> None:
     with globals.index_client:
         for t in globals.startup_handlers:
             safe_invoke(t)
+    for client_id in globals.clients:
+        globals.backend.register_client(client_id)
+    background_tasks.create(globals.backend.start(handle_backend_message))
     background_tasks.create(binding.loop())
     background_tasks.create(outbox.loop())
     background_tasks.create(prune_clients())
-    background_tasks.create(prune_slot_stacks())
+    background_tasks.create(hibernate_clients())
+    background_tasks.create(evict_clients())
     globals.state = globals.State.STARTED
     if with_welcome_message:
         background_tasks.create(welcome.print_message())
@@ -107,6 +114,7 @@ async def handle_shutdown() -> None:
         for t in globals.shutdown_handlers:
             safe_invoke(t)
     globals.state = globals.State.STOPPED
+    await globals.backend.stop()
     if globals.air:
         await globals.air.disconnect()
 
@@ -127,18 +135,56 @@ async def exception_handler_500(request: Request, exception: Exception) -> Respo
     return client.build_response(request, 500)
 
 
+# NOTE: socket ID -> (client ID, worker ID) of clients owned by other workers
+forwarded_sockets: Dict[str, Tuple[str, str]] = {}
+disconnected_clients: Dict[str, asyncio.TimerHandle] = {}  # NOTE: client ID -> deletion unless the browser reconnects
+
+
 @sio.on('handshake')
-def on_handshake(sid: str) -> bool:
+async def on_handshake(sid: str, data: Optional[Dict[str, Any]] = None) -> Union[bool, int]:
     client = get_client(sid)
     if not client:
+        return await forward_handshake(sid)
+    last_seq = (data or {}).get('last_seq')
+    sio.enter_room(sid, client.id)
+    if last_seq is not None and not await outbox.replay(client.id, sid, last_seq):
+        sio.leave_room(sid, client.id)
         return False
     client.environ = sio.get_environ(sid)
-    sio.enter_room(sid, client.id)
-    handle_handshake(client)
+    handle_handshake(client, resync=last_seq is None)
+    return outbox.last_sequence_number(client.id)
+
+
+async def forward_handshake(sid: str) -> bool:
+    client_id = get_client_id(sid)
+    worker_id = await globals.backend.find_owner(client_id)
+    if worker_id is None or worker_id == globals.backend.worker_id:
+        return False
+    forwarded_sockets[sid] = (client_id, worker_id)
+    sio.enter_room(sid, client_id)
+    scope = sio.get_environ(sid)['asgi.scope']
+    environ = {'asgi.scope': {
+        'client': scope.get('client'),
+        'headers': [[key.decode('latin-1'), value.decode('latin-1')] for key, value in scope.get('headers', [])],
+    }}
+    await forward(sid, 'handshake', {'worker_id': globals.backend.worker_id, 'environ': environ})
     return True
 
 
-def handle_handshake(client: Client) -> None:
+async def forward(sid: str, message_type: str, data: Dict[str, Any]) -> None:
+    client_id, worker_id = forwarded_sockets[sid]
+    await globals.backend.forward(worker_id, {'type': message_type, 'client_id': client_id, **data})
+
+
+def handle_handshake(client: Client, *, resync: bool = True) -> None:
+    reconnect = disconnected_clients.pop(client.id, None)
+    if reconnect is not None:
+        reconnect.cancel()
+    if resync:
+        client.reset_synced_state()  # NOTE: patches sent before the handshake might not have reached the browser
+        for tree in client.mounted_trees.values():
+            outbox.enqueue_message('update', tree._to_dict(), client.id)  # pylint: disable=protected-access
+    client.handle_handshake()
     for t in client.connect_handlers:
         safe_invoke(t, client)
     for t in globals.connect_handlers:
@@ -146,16 +192,31 @@ def handle_handshake(client: Client) -> None:
 
 
 @sio.on('disconnect')
-def on_disconnect(sid: str) -> None:
+async def on_disconnect(sid: str) -> None:
+    outbox.forget(sid)  # NOTE: messages might have been sent to this socket only, e.g. when initializing an element
+    if sid in forwarded_sockets:
+        is_last = list(forwarded_sockets.values()).count(forwarded_sockets[sid]) == 1
+        await forward(sid, 'disconnect', {'worker_id': globals.backend.worker_id, 'is_last': is_last})
+        del forwarded_sockets[sid]
+        return
     client = get_client(sid)
     if not client:
         return
+    if not client.shared and any(other != sid for other, _ in sio.manager.get_participants('/', client.id)):
+        return  # NOTE: the browser has already reconnected with a new socket
     handle_disconnect(client)
 
 
 def handle_disconnect(client: Client) -> None:
     if not client.shared:
-        delete_client(client.id)
+        client.environ = None
+        if globals.reconnect_timeout > 0:
+            assert globals.loop is not None
+            disconnected_clients[client.id] = \
+                globals.loop.call_later(globals.reconnect_timeout, delete_client, client.id)
+        else:
+            delete_client(client.id)
+    client.handle_disconnect()
     for t in client.disconnect_handlers:
         safe_invoke(t, client)
     for t in globals.disconnect_handlers:
@@ -163,7 +224,12 @@ def handle_disconnect(client: Client) -> None:
 
 
 @sio.on('event')
-def on_event(sid: str, msg: Dict) -> None:
+async def on_event(sid: str, msg: Dict) -> None:
+    if sid in forwarded_sockets:
+        if isinstance(msg.get('args'), dict) and 'socket_id' in msg['args']:
+            msg['args']['socket_id'] = forwarded_sockets[sid][0]  # HACK: translate socket_id of ui.scene's init event
+        await forward(sid, 'event', {'msg': msg})
+        return
     client = get_client(sid)
     if not client or not client.has_socket_connection:
         return
@@ -171,8 +237,9 @@ def on_event(sid: str, msg: Dict) -> None:
 
 
 def handle_event(client: Client, msg: Dict) -> None:
+    client.last_activity = time.time()
     with client:
-        sender = client.elements.get(msg['id'])
+        sender = client.find_element(msg['id'])
         if sender:
             msg['args'] = [None if arg is None else json.loads(arg) for arg in msg.get('args', [])]
             if len(msg['args']) == 1:
@@ -181,7 +248,10 @@ def handle_event(client: Client, msg: Dict) -> None:
 
 
 @sio.on('javascript_response')
-def on_javascript_response(sid: str, msg: Dict) -> None:
+async def on_javascript_response(sid: str, msg: Dict) -> None:
+    if sid in forwarded_sockets:
+        await forward(sid, 'javascript_response', {'msg': msg})
+        return
     client = get_client(sid)
     if not client:
         return
@@ -189,47 +259,110 @@ def on_javascript_response(sid: str, msg: Dict) -> None:
 
 
 def handle_javascript_response(client: Client, msg: Dict) -> None:
-    client.waiting_javascript_commands[msg['request_id']] = msg['result']
+    client.handle_javascript_response(msg)
 
 
-def get_client(sid: str) -> Optional[Client]:
+async def handle_backend_message(message: Dict[str, Any]) -> None:
+    if message['type'] == 'emit':
+        await sio.emit(message['event'], message['data'], room=message['room'])
+        return
+    client = globals.clients.get(message['client_id'])
+    if not client:
+        return
+    if message['type'] == 'handshake':
+        client.environ = message['environ']
+        client.remote_workers.add(message['worker_id'])
+        handle_handshake(client)
+    elif message['type'] == 'disconnect':
+        if message.get('is_last', True):
+            client.remote_workers.discard(message['worker_id'])  # NOTE: it has no more sockets for this client
+        handle_disconnect(client)
+    elif message['type'] == 'event':
+        handle_event(client, message['msg'])
+    elif message['type'] == 'javascript_response':
+        handle_javascript_response(client, message['msg'])
+
+
+def get_client_id(sid: str) -> str:
     query_bytes: bytearray = sio.get_environ(sid)['asgi.scope']['query_string']
     query = urllib.parse.parse_qs(query_bytes.decode())
-    client_id = query['client_id'][0]
-    return globals.clients.get(client_id)
+    return query['client_id'][0]
+
+
+def get_client(sid: str) -> Optional[Client]:
+    return globals.clients.get(get_client_id(sid))
 
 
 async def prune_clients() -> None:
     while True:
-        stale_clients = [
-            id
-            for id, client in globals.clients.items()
-            if not client.shared and not client.has_socket_connection and client.created < time.time() - 60.0
-        ]
-        for client_id in stale_clients:
-            delete_client(client_id)
+        while connection_deadlines and connection_deadlines[0][0] < time.time():
+            _, client_id = heapq.heappop(connection_deadlines)
+            client = globals.clients.get(client_id)
+            if client is not None and not client.has_socket_connection and client_id not in disconnected_clients:
+                delete_client(client_id)
+        await asyncio.sleep(connection_deadlines[0][0] - time.time() if connection_deadlines else 10)
+
+
+MAX_EVICTIONS_PER_TICK = 10  # NOTE: spreads the work of evicting many clients over several iterations
+
+
+async def evict_clients() -> None:
+    while True:
+        if globals.max_client_bytes is not None or globals.max_total_bytes is not None:
+            await evict_clients_exceeding_limits()
         await asyncio.sleep(10)
 
 
-async def prune_slot_stacks() -> None:
+async def evict_clients_exceeding_limits() -> None:
+    """Evict disconnected or idle clients which are too large or, while memory is short, the least recently active ones.
+
+    The usage of each client is a running total, so nothing needs to be serialized here.
+    Connected clients are only evicted after `eviction_idle_timeout`; their browsers reload the page.
+    """
+    usages = {client_id: client.used_bytes for client_id, client in globals.clients.items()}
+    total_bytes = sum(usages.values())
+    idle_since = time.time() - globals.eviction_idle_timeout
+
+    def is_evictable(client: Client) -> bool:
+        return not client.shared and (not client.has_socket_connection or client.last_activity < idle_since)
+
+    def is_too_large(client: Client) -> bool:
+        return globals.max_client_bytes is not None and usages[client.id] > globals.max_client_bytes
+    candidates = heapq.nsmallest(MAX_EVICTIONS_PER_TICK, filter(is_evictable, globals.clients.values()),
+                                 key=lambda client: (not is_too_large(client), client.last_activity))
+    for client in candidates:
+        too_many = globals.max_total_bytes is not None and total_bytes > globals.max_total_bytes
+        if client.id in globals.clients and (is_too_large(client) or too_many):
+            globals.log.warning(f'evicting client {client.id} using about {usages[client.id]} bytes')
+            total_bytes -= usages[client.id]
+            await evict_client(client.id)
+
+
+async def evict_client(client_id: str) -> None:
+    sids = [sid for sid, _ in sio.manager.get_participants('/', client_id)] if sio.manager.rooms.get('/') else []
+    delete_client(client_id)
+    for sid in sids:
+        await sio.disconnect(sid)  # NOTE: the browser will reload the page after failing to reconnect
+
+
+async def hibernate_clients() -> None:
     while True:
-        running = [
-            id(task)
-            for task in asyncio.tasks.all_tasks()
-            if not task.done() and not task.cancelled()
-        ]
-        stale = [
-            id_
-            for id_ in globals.slot_stacks
-            if id_ not in running
-        ]
-        for id_ in stale:
-            del globals.slot_stacks[id_]
+        if globals.hibernation_timeout is not None:
+            idle_since = time.time() - globals.hibernation_timeout
+            for client in globals.clients.values():  # NOTE: shared clients are in use by their subscribers
+                if not client.shared and not client.is_hibernating and client.last_activity < idle_since:
+                    client.hibernate()
         await asyncio.sleep(10)
 
 
 def delete_client(client_id: str) -> None:
+    reconnect = disconnected_clients.pop(client_id, None)
+    if reconnect is not None:
+        reconnect.cancel()
     binding.remove(list(globals.clients[client_id].elements.values()), Element)
     for element in globals.clients[client_id].elements.values():
         element.delete()
-    del globals.clients[client_id]
+    client = globals.clients.pop(client_id)
+    client.handle_disconnect()
+    outbox.forget(client_id)
+    globals.backend.unregister_client(client_id)
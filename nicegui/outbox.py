@@ -1,70 +1,448 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from collections import defaultdict, deque
-from typing import TYPE_CHECKING, Any, DefaultDict, Deque, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, DefaultDict, Deque, Dict, List, Optional, Tuple, Union
 
-from . import globals  # pylint: disable=redefined-builtin
+from socketio import packet
+
+from nicegui import json
+
+from . import arrays, background_tasks, globals  # pylint: disable=redefined-builtin
 
 if TYPE_CHECKING:
+    from .client import Client
     from .element import Element
 
 ClientId = str
 ElementId = int
 MessageType = str
-Message = Tuple[ClientId, MessageType, Any]
+Message = Tuple[ClientId, MessageType, Any, Any]
+OutgoingMessage = Tuple[MessageType, Any, Any, Optional[str]]  # NOTE: type, data, binary data and JSON of the data
+
+FRAME_EVENT = 'messages'  # NOTE: all messages of a flush are sent to each target as a single ordered frame
+SEQ_EVENT = 'seq'  # NOTE: announces the sequence number of the following frame, which is shared by many clients
 
 update_queue: DefaultDict[ClientId, Dict[ElementId, Optional[Element]]] = defaultdict(dict)
+forget_queue: DefaultDict[ClientId, List[ElementId]] = defaultdict(list)  # NOTE: IDs given up by elements
 message_queue: Deque[Message] = deque()
+enqueue_event: Optional[asyncio.Event] = None
+flush_count = 0  # NOTE: incremented whenever the queued messages are taken for sending; data can be amended until then
+
+# NOTE: content-addressed caches which are only valid during a single flush
+encoding_cache: Optional[Dict[int, Tuple[Any, str]]] = None
+frame_cache: Dict[str, str] = {}
+
+# NOTE: each target is served by its own sender task so that a slow connection does not hold back the others;
+# messages arriving while the sender waits for the browsers to catch up are collected in a bounded backlog
+send_queues: Dict[ClientId, Tuple[List[OutgoingMessage], Optional[str]]] = {}
+senders: Dict[ClientId, asyncio.Task] = {}
+drop_counts: DefaultDict[ClientId, int] = defaultdict(int)  # NOTE: superseded or overflowing messages per target
+
+# NOTE: frames are numbered per client and the last ones are kept so that a reconnecting browser can catch up;
+# frames for a single socket (e.g. while initializing an element) are sent without a sequence number
+sequence_numbers: Dict[ClientId, int] = {}
+history: Dict[ClientId, Deque[Tuple[int, Union[str, List[Any]]]]] = {}
+history_bytes: DefaultDict[ClientId, int] = defaultdict(int)
+locks: Dict[ClientId, asyncio.Lock] = {}  # NOTE: keeps live frames from overtaking replayed ones
 
 
 def enqueue_update(element: Element) -> None:
+    if not _is_synced(element.client):
+        return
     update_queue[element.client.id][element.id] = element
+    _notify()
 
 
 def enqueue_delete(element: Element) -> None:
+    """Queue the removal of an element and all its descendants."""
+    if not _is_synced(element.client):
+        return
     update_queue[element.client.id][element.id] = None
+    _notify()
+
+
+def enqueue_forget(element: Element) -> None:
+    """Queue the removal of the element's current ID without its descendants, which might still be in use.
+
+    This is needed when an element which has already been sent takes over the ID of another element.
+    """
+    if not _is_synced(element.client):
+        return
+    forget_queue[element.client.id].append(element.id)
+    _notify()
+
+
+def _is_synced(client: Client) -> bool:
+    """Whether changes of the elements of the client need to be sent.
+
+    This is not the case while the page is being built, because it will contain the current state of all elements,
+    and after the client has been deleted.
+    """
+    return not client.is_building and client.id in globals.clients
+
+
+def enqueue_message(message_type: MessageType, data: Any, target_id: ClientId, binary_data: Any = None) -> None:
+    """Queue a message for the client.
+
+    :param binary_data: version of the data with NumPy arrays replaced by binary attachments (see `arrays.encode`)
+    """
+    message_queue.append((target_id, message_type, data, binary_data))
+    _notify()
+
+
+def _notify() -> None:
+    """Wake up the outbox loop (which might be waiting in another thread's event loop)."""
+    if enqueue_event is None or globals.loop is None:
+        return
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is globals.loop:
+        enqueue_event.set()
+    else:
+        globals.loop.call_soon_threadsafe(enqueue_event.set)
+
+
+def dumps(value: Any) -> str:
+    """Encode a value as JSON.
+
+    While a flush is being prepared, containers are encoded only once,
+    even if they are shared by the elements of many clients.
+    """
+    if encoding_cache is None or not isinstance(value, (dict, list)):
+        return json.dumps(value)
+    entry = encoding_cache.get(id(value))
+    if entry is None:
+        entry = encoding_cache[id(value)] = (value, json.dumps(value))  # NOTE: keep the value alive to keep its ID
+    return entry[1]
+
+
+def _add_to_frame(frames: Dict[ClientId, List[OutgoingMessage]], target_id: ClientId,
+                  message: OutgoingMessage) -> None:
+    client = globals.clients.get(target_id)
+    if client is not None and client.subscriber_ids is not None:
+        for subscriber_id in client.subscriber_ids:  # NOTE: shared trees are shown by their subscribers
+            frames.setdefault(subscriber_id, []).append(message)
+    else:
+        frames.setdefault(target_id, []).append(message)
+
+
+def _encode_frame(messages: List[OutgoingMessage]) -> Optional[str]:
+    """Encode all messages of a flush for one target as a Socket.IO event packet.
+
+    The packet is assembled from the JSON of each message and encoded only once per flush
+    for all targets receiving the same content.
+    Therefore it does not contain the per-target sequence number, which is sent separately (see `_encode_seq`).
+    Frames with binary attachments are not encoded here (see `_encode_packet`).
+    """
+    if any(binary_data is not None for _, _, binary_data, _ in messages):
+        return None
+    frame = f'{packet.EVENT}["{FRAME_EVENT}",[' + \
+        ','.join(f'[{json.dumps(message_type)},{dumps(data) if data_json is None else data_json}]'
+                 for message_type, data, _, data_json in messages) + ']]'  # NOTE: same as `Packet.encode` would produce
+    if encoding_cache is None:
+        return frame
+    return frame_cache.setdefault(frame, frame)
+
+
+def _encode_packet(messages: List[OutgoingMessage], frame: Optional[str]) -> Union[str, List[Any]]:
+    """Return the encoded frame or encode a frame with binary attachments as a Socket.IO event packet."""
+    if frame is not None:
+        return frame
+    data = [[message_type, data if binary_data is None else binary_data]
+            for message_type, data, binary_data, _ in messages]
+    return globals.sio.packet_class(packet.EVENT, data=[FRAME_EVENT, data]).encode()
+
+
+def _encode_seq(seq: int) -> str:
+    return f'{packet.EVENT}["{SEQ_EVENT}",{seq}]'
+
+
+def _parts(encoded: Union[str, List[Any]], seq: Optional[int] = None) -> List[Any]:
+    """Return the Engine.IO packets of an encoded frame, preceded by its sequence number (if any)."""
+    parts = encoded if isinstance(encoded, list) else [encoded]
+    return parts if seq is None else [_encode_seq(seq), *parts]
+
+
+def _size(encoded: Union[str, List[Any]]) -> int:
+    return sum(len(part) for part in _parts(encoded))
+
+
+def queue_depth(target_id: ClientId) -> int:
+    """Return the number of messages waiting for the busy sender of the given target."""
+    return len(send_queues[target_id][0]) if target_id in send_queues else 0
+
 
+def queue_bytes(target_id: ClientId) -> int:
+    """Return the approximate size of the frames waiting for the busy sender of the given target."""
+    return len(send_queues[target_id][1] or '') if target_id in send_queues else 0
 
-def enqueue_message(message_type: MessageType, data: Any, target_id: ClientId) -> None:
-    message_queue.append((target_id, message_type, data))
 
+def _schedule(target_id: ClientId, messages: List[OutgoingMessage]) -> None:
+    if target_id not in senders:
+        send_queues[target_id] = (messages, _encode_frame(messages))
+        senders[target_id] = background_tasks.create(_send(target_id), name=f'outbox {target_id}')
+        return
+    backlog = send_queues.pop(target_id, ([], None))[0]
+    backlog = _supersede(target_id, backlog, messages)
+    if len(backlog) > globals.outbox_max_pending:
+        kept = [message for message in backlog if message[0] not in {'update', 'patch'}]
+        if len(kept) < len(backlog):
+            drop_counts[target_id] += len(backlog) - len(kept)
+            _resync(target_id)  # NOTE: replaces the dropped updates and patches, but not the other messages
+        backlog = kept
+    send_queues[target_id] = (backlog, None)
 
-async def _emit(message_type: MessageType, data: Any, target_id: ClientId) -> None:
-    await globals.sio.emit(message_type, data, room=target_id)
+
+def _supersede(target_id: ClientId, backlog: List[OutgoingMessage],
+               messages: List[OutgoingMessage]) -> List[OutgoingMessage]:
+    """Append messages to a backlog, removing pending updates and patches of elements which are sent in full again."""
+    ids = {id for message_type, data, _, _ in messages if message_type == 'update' for id in data}
+    if not ids:
+        return backlog + messages
+    result: List[OutgoingMessage] = []
+    for message_type, data, binary_data, data_json in backlog:
+        if message_type not in {'update', 'patch'} or ids.isdisjoint(data):
+            result.append((message_type, data, binary_data, data_json))
+            continue
+        drop_counts[target_id] += len(ids.intersection(data))
+        data = {id: value for id, value in data.items() if id not in ids}
+        if data:
+            if binary_data is not None:
+                binary_data = {id: value for id, value in binary_data.items() if id not in ids}
+            result.append((message_type, data, binary_data, None))
+    return result + messages
+
+
+def _resync(target_id: ClientId) -> None:
+    """Send the full state of a client again after its backlog has been dropped."""
+    client = globals.clients.get(target_id)
+    if client is None:
+        return
+    client.reset_synced_state()
+    for element in client.elements.values():
+        enqueue_update(element)
+    for tree in client.mounted_trees.values():
+        enqueue_message('update', tree._to_dict(), client.id)  # pylint: disable=protected-access
+
+
+async def _send(target_id: ClientId) -> None:
+    try:
+        while target_id in send_queues:
+            messages, frame = send_queues.pop(target_id)
+            try:
+                encoded = _encode_packet(messages, _encode_frame(messages) if frame is None else frame)
+                if target_id not in globals.clients:
+                    await _emit_frame(target_id, messages, encoded)
+                    continue
+                async with _lock(target_id):
+                    seq = sequence_numbers[target_id] = sequence_numbers.get(target_id, 0) + 1
+                    _remember(target_id, seq, encoded)
+                    await _emit_frame(target_id, messages, encoded, seq)
+                await _drain(target_id)
+            except Exception as e:
+                globals.handle_exception(e)
+    finally:
+        del senders[target_id]
+
+
+def _queued_packets(target_id: ClientId) -> List[int]:
+    """Return the number of packets waiting to be written to each browser socket of the given target."""
+    if not globals.sio.manager.rooms.get('/'):
+        return []
+    sizes: List[int] = []
+    for _, eio_sid in globals.sio.manager.get_participants('/', target_id):
+        socket = globals.sio.eio.sockets.get(eio_sid)
+        if socket is not None and not socket.closed:
+            sizes.append(socket.queue.qsize())
+    return sizes
+
+
+async def _drain(target_id: ClientId) -> None:
+    """Wait until the browsers of the target have caught up with the packets sent to them.
+
+    Sending only queues the packets, so this is where a slow connection holds back its sender,
+    while new messages are collected in the backlog and superseded updates are dropped.
+    Sockets which have been closed or left the room do not need to be waited for.
+    """
+    while any(size > globals.outbox_max_queued for size in _queued_packets(target_id)):
+        await asyncio.sleep(0.01)
+
+
+def _lock(target_id: ClientId) -> asyncio.Lock:
+    if target_id not in locks:
+        locks[target_id] = asyncio.Lock()
+    return locks[target_id]
+
+
+def _remember(target_id: ClientId, seq: int, encoded: Union[str, List[Any]]) -> None:
+    """Keep a sent frame for replaying, dropping the oldest ones beyond the configured number and size."""
+    frames = history.setdefault(target_id, deque())
+    frames.append((seq, encoded))
+    history_bytes[target_id] += _size(encoded)
+    while frames and (len(frames) > globals.outbox_history_size or
+                      history_bytes[target_id] > globals.outbox_history_bytes):
+        history_bytes[target_id] -= _size(frames.popleft()[1])
+
+
+async def replay(target_id: ClientId, sid: str, last_seq: int) -> bool:
+    """Send the frames a reconnecting browser has missed since the given sequence number.
+
+    Live frames are held back meanwhile, so that they do not arrive ahead of the replayed ones.
+
+    :return: whether all missed frames were still available
+    """
+    async with _lock(target_id):
+        frames = [(seq, encoded) for seq, encoded in history.get(target_id, ()) if seq > last_seq]
+        if len(frames) != sequence_numbers.get(target_id, 0) - last_seq:
+            return False
+        eio_sid = globals.sio.manager.eio_sid_from_sid(sid, '/')
+        for seq, encoded in frames:
+            for part in _parts(encoded, seq):
+                await globals.sio.eio.send(eio_sid, part)
+        return True
+
+
+def last_sequence_number(target_id: ClientId) -> int:
+    """Return the sequence number of the last frame sent to the given target."""
+    return sequence_numbers.get(target_id, 0)
+
+
+def forget(target_id: ClientId) -> None:
+    """Remove the pending updates, the counters and the frame history of a target which does not exist anymore."""
+    update_queue.pop(target_id, None)
+    forget_queue.pop(target_id, None)
+    drop_counts.pop(target_id, None)
+    sequence_numbers.pop(target_id, None)
+    history.pop(target_id, None)
+    history_bytes.pop(target_id, None)
+    locks.pop(target_id, None)
+
+
+async def _emit_frame(target_id: ClientId, messages: List[OutgoingMessage], encoded: Union[str, List[Any]],
+                      seq: Optional[int] = None) -> None:
+    """Send a frame to all browsers in the target room, to On Air and to other workers.
+
+    The sequence number is sent to the browsers right before the frame,
+    which itself is the same object for all targets receiving the same content.
+    """
+    if globals.sio.manager.rooms.get('/'):
+        for _, eio_sid in globals.sio.manager.get_participants('/', target_id):
+            for part in _parts(encoded, seq):  # NOTE: `send` only queues, so no other packet can get in between
+                await globals.sio.eio.send(eio_sid, part)
+    data = [[message_type, data] for message_type, data, _, _ in messages]  # NOTE: binary attachments only for browsers
     if is_target_on_air(target_id):
         assert globals.air is not None
-        await globals.air.emit(message_type, data, room=target_id)
+        await globals.air.emit(FRAME_EVENT, data, room=target_id)
+    client = globals.clients.get(target_id)
+    if client is not None:
+        for worker_id in list(client.remote_workers):
+            message = {'type': 'emit', 'event': FRAME_EVENT, 'data': data, 'room': target_id}
+            if not await globals.backend.forward(worker_id, message):
+                client.remote_workers.discard(worker_id)  # NOTE: the worker has gone away
+
+
+async def _coalesce() -> None:
+    """Give further updates the chance to join the current flush.
+
+    The flush is delayed as long as new items keep arriving within the coalescing window,
+    but never longer than the maximum latency.
+    """
+    assert enqueue_event is not None
+    if globals.outbox_coalescing_window <= 0:
+        return
+    deadline = time.time() + globals.outbox_max_latency
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        enqueue_event.clear()
+        try:
+            await asyncio.wait_for(enqueue_event.wait(), min(globals.outbox_coalescing_window, remaining))
+        except asyncio.TimeoutError:
+            return
+
+
+def _collect_frames() -> Dict[ClientId, List[OutgoingMessage]]:
+    """Take all queued updates and messages and group them into one frame per target."""
+    global flush_count  # pylint: disable=global-statement
+    frames: Dict[ClientId, List[OutgoingMessage]] = {}
+    for client_id, elements in update_queue.items():
+        client = globals.clients.get(client_id)
+        if client is not None:
+            client.wake()
+        updates: Dict[ElementId, Dict[str, Any]] = {}
+        patches: Dict[ElementId, Dict[str, Any]] = {}
+        update_json: List[str] = []
+        patch_json: List[str] = []
+        binary_updates: Optional[Dict[ElementId, Dict[str, Any]]] = None
+        binary_patches: Optional[Dict[ElementId, Dict[str, Any]]] = None
+        deleted: List[ElementId] = []
+        for element_id, element in elements.items():
+            if element is None:
+                deleted.append(element_id)
+                continue
+            data = element._to_dict()  # pylint: disable=protected-access
+            patch = element._to_patch(data)  # pylint: disable=protected-access
+            if patch is None:
+                updates[element_id] = data
+                update_json.append(f'"{element_id}":{element._to_json()}')  # pylint: disable=protected-access
+                if element.binary_arrays:
+                    binary_updates = binary_updates or {}
+                    binary_updates[element_id] = arrays.encode(data)
+            elif patch:
+                patches[element_id] = patch
+                patch_json.append(f'"{element_id}":{element._patch_to_json(patch)}')  # pylint: disable=protected-access
+                if element.binary_arrays:
+                    binary_patches = binary_patches or {}
+                    binary_patches[element_id] = arrays.encode(patch)
+        if updates:
+            _add_to_frame(frames, client_id, (
+                'update', updates, binary_updates and {**updates, **binary_updates},
+                '{' + ','.join(update_json) + '}'))
+        if patches:
+            _add_to_frame(frames, client_id, (
+                'patch', patches, binary_patches and {**patches, **binary_patches},
+                '{' + ','.join(patch_json) + '}'))
+        if deleted:  # NOTE: last, so that the browser knows the current children of the removed subtrees
+            _add_to_frame(frames, client_id, ('delete', deleted, None, None))
+    update_queue.clear()
+
+    for client_id, element_ids in forget_queue.items():  # NOTE: after the updates which refer to the new IDs
+        _add_to_frame(frames, client_id, ('forget', element_ids, None, None))
+    forget_queue.clear()
+
+    for target_id, message_type, data, binary_data in message_queue:
+        _add_to_frame(frames, target_id, (message_type, data, binary_data, None))
+    message_queue.clear()
+    flush_count += 1
+    return frames
 
 
 async def loop() -> None:
+    global enqueue_event, encoding_cache  # pylint: disable=global-statement
+    enqueue_event = asyncio.Event()
     while True:
-        if not update_queue and not message_queue:
-            await asyncio.sleep(0.01)
-            continue
+        if not update_queue and not forget_queue and not message_queue:
+            enqueue_event.clear()
+            await enqueue_event.wait()
+        await _coalesce()
 
-        coros = []
         try:
-            for client_id, elements in update_queue.items():
-                data = {
-                    element_id: None if element is None else element._to_dict()  # pylint: disable=protected-access
-                    for element_id, element in elements.items()
-                }
-                coros.append(_emit('update', data, client_id))
-            update_queue.clear()
-
-            for target_id, message_type, data in message_queue:
-                coros.append(_emit(message_type, data, target_id))
-            message_queue.clear()
-
-            for coro in coros:
-                try:
-                    await coro
-                except Exception as e:
-                    globals.handle_exception(e)
+            encoding_cache = {}
+            for target_id, messages in _collect_frames().items():
+                _schedule(target_id, messages)
+            encoding_cache = None
+            await asyncio.sleep(0)  # NOTE: let the senders start before preparing the next flush
         except Exception as e:
             globals.handle_exception(e)
             await asyncio.sleep(0.1)
+        finally:
+            encoding_cache = None
+            frame_cache.clear()
 
 
 def is_target_on_air(target_id: str) -> bool:
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
@@ -83,6 +82,9 @@ class page:
             request = dec_kwargs['request']
             # NOTE cleaning up the keyword args so the signature is consistent with "func" again
             dec_kwargs = {k: v for k, v in dec_kwargs.items() if k in parameters_of_decorated_func}
+            if 'session' in request.scope and 'id' in request.session:
+                # NOTE: the user storage might have been modified by other workers; static files do not need it
+                await globals.app.storage._refresh_user(request.session['id'])  # pylint: disable=protected-access
             with Client(self) as client:
                 if any(p.name == 'client' for p in inspect.signature(func).parameters.values()):
                     dec_kwargs['client'] = client
@@ -92,11 +94,16 @@ class page:
                     with client:
                         return await result
                 task = background_tasks.create(wait_for_result())
-                deadline = time.time() + self.response_timeout
-                while task and not client.is_waiting_for_connection and not task.done():
-                    if time.time() > deadline:
-                        raise TimeoutError(f'Response not ready after {self.response_timeout} seconds')
-                    await asyncio.sleep(0.1)
+                # NOTE: the page is delivered as soon as the builder is done or waits for the connection
+                connection_request = asyncio.ensure_future(
+                    client._connection_requested())  # pylint: disable=protected-access
+                try:
+                    done, _ = await asyncio.wait({task, connection_request}, timeout=self.response_timeout,
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    connection_request.cancel()
+                if not done:
+                    raise TimeoutError(f'Response not ready after {self.response_timeout} seconds')
                 result = task.result() if task.done() else None
             if isinstance(result, Response):  # NOTE if setup returns a response, we don't need to render the page
                 return result
@@ -15,6 +15,7 @@ from . import globals, helpers
 from . import native as native_module
 from . import native_mode
 from .air import Air
+from .backend import Backend
 from .language import Language
 
 APP_IMPORT_STRING = 'nicegui:app'
@@ -49,6 +50,13 @@ def run(*,
         dark: Optional[bool] = False,
         language: Language = 'en-US',
         binding_refresh_interval: float = 0.1,
+        reconnect_timeout: float = 3.0,
+        outbox_coalescing_window: float = 0.0,
+        outbox_max_latency: float = 0.1,
+        hibernation_timeout: Optional[float] = None,
+        max_client_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        eviction_idle_timeout: float = 600.0,
         show: bool = True,
         on_air: Optional[Union[str, Literal[True]]] = None,
         native: bool = False,
@@ -64,6 +72,7 @@ def run(*,
         prod_js: bool = True,
         endpoint_documentation: Literal['none', 'internal', 'page', 'all'] = 'none',
         storage_secret: Optional[str] = None,
+        backend: Optional[Backend] = None,
         **kwargs: Any,
         ) -> None:
     '''ui.run
@@ -78,6 +87,16 @@ def run(*,
     :param dark: whether to use Quasar's dark mode (default: `False`, use `None` for "auto" mode)
     :param language: language for Quasar elements (default: `'en-US'`)
     :param binding_refresh_interval: time between binding updates (default: `0.1` seconds, bigger is more CPU friendly)
+    :param reconnect_timeout: maximum time the server waits for the browser to reconnect (default: `3.0` seconds)
+    :param outbox_coalescing_window: time to wait for further updates before sending them to the browser
+                                     (default: `0.0` seconds, i.e. send with the next iteration of the event loop)
+    :param outbox_max_latency: maximum time updates are delayed while more keep coming in (default: `0.1` seconds)
+    :param hibernation_timeout: idle time after which the state kept for sending only changes to a browser is released
+                                (default: `None`, never)
+    :param max_client_bytes: memory a client may use before it is evicted (default: `None`, unlimited)
+    :param max_total_bytes: memory all clients may use before the least recently active ones are evicted
+                            (default: `None`, unlimited)
+    :param eviction_idle_timeout: idle time after which connected clients can be evicted, too (default: `600.0` seconds)
     :param show: automatically open the UI in a browser tab (default: `True`)
     :param on_air: tech preview: `allows temporary remote access <https://nicegui.io/documentation#nicegui_on_air>`_ if set to `True` (default: disabled)
     :param native: open the UI in a native window of size 800x600 (default: `False`, deactivates `show`, automatically finds an open port)
@@ -93,6 +112,8 @@ def run(*,
     :param prod_js: whether to use the production version of Vue and Quasar dependencies (default: `True`)
     :param endpoint_documentation: control what endpoints appear in the autogenerated OpenAPI docs (default: 'none', options: 'none', 'internal', 'page', 'all')
     :param storage_secret: secret key for browser-based storage (default: `None`, a value is required to enable ui.storage.individual and ui.storage.browser)
+    :param backend: backend for sharing clients and user storage between workers, e.g. `RedisBackend`
+                    (default: `None`, everything is kept in-process)
     :param kwargs: additional keyword arguments are passed to `uvicorn.run`    
     '''
     globals.ui_run_has_been_called = True
@@ -103,9 +124,18 @@ def run(*,
     globals.dark = dark
     globals.language = language
     globals.binding_refresh_interval = binding_refresh_interval
+    globals.reconnect_timeout = reconnect_timeout
+    globals.outbox_coalescing_window = outbox_coalescing_window
+    globals.outbox_max_latency = outbox_max_latency
+    globals.hibernation_timeout = hibernation_timeout
+    globals.max_client_bytes = max_client_bytes
+    globals.max_total_bytes = max_total_bytes
+    globals.eviction_idle_timeout = eviction_idle_timeout
     globals.tailwind = tailwind
     globals.prod_js = prod_js
     globals.endpoint_documentation = endpoint_documentation
+    if backend is not None:
+        globals.backend = backend
 
     for route in globals.app.routes:
         if not isinstance(route, Route):
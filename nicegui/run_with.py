@@ -17,6 +17,13 @@ def run_with(
     dark: Optional[bool] = False,
     language: Language = 'en-US',
     binding_refresh_interval: float = 0.1,
+    reconnect_timeout: float = 3.0,
+    outbox_coalescing_window: float = 0.0,
+    outbox_max_latency: float = 0.1,
+    hibernation_timeout: Optional[float] = None,
+    max_client_bytes: Optional[int] = None,
+    max_total_bytes: Optional[int] = None,
+    eviction_idle_timeout: float = 600.0,
     mount_path: str = '/',
     tailwind: bool = True,
     prod_js: bool = True,
@@ -29,6 +36,13 @@ def run_with(
     globals.dark = dark
     globals.language = language
     globals.binding_refresh_interval = binding_refresh_interval
+    globals.reconnect_timeout = reconnect_timeout
+    globals.outbox_coalescing_window = outbox_coalescing_window
+    globals.outbox_max_latency = outbox_max_latency
+    globals.hibernation_timeout = hibernation_timeout
+    globals.max_client_bytes = max_client_bytes
+    globals.max_total_bytes = max_total_bytes
+    globals.eviction_idle_timeout = eviction_idle_timeout
     globals.tailwind = tailwind
     globals.prod_js = prod_js
 
@@ -3,6 +3,7 @@ import json
 import uuid
 from collections.abc import MutableMapping
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any, Dict, Iterator, Optional, Union
 
 import aiofiles
@@ -12,7 +13,32 @@ from starlette.responses import Response
 
 from . import background_tasks, globals, observables  # pylint: disable=redefined-builtin
 
-request_contextvar: contextvars.ContextVar[Optional[Request]] = contextvars.ContextVar('request_var', default=None)
+
+class SessionReference:
+    """Stand-in for a request which only keeps its session.
+
+    Event listeners hold on to this instead of the whole request,
+    which is released as soon as the response has been sent.
+    """
+    __slots__ = ('session',)
+    state = SimpleNamespace(responded=True)  # NOTE: events are only handled after the response has been sent
+
+    def __init__(self, session: Dict) -> None:
+        self.session = session
+
+
+request_contextvar: contextvars.ContextVar[Optional[Union[Request, SessionReference]]] = \
+    contextvars.ContextVar('request_var', default=None)
+
+
+def get_session_reference() -> Optional[SessionReference]:
+    """Return a reference to the session of the current request, shared by all event listeners created with it."""
+    request = request_contextvar.get()
+    if request is None or isinstance(request, SessionReference):
+        return request
+    if not hasattr(request.state, 'session_reference'):
+        request.state.session_reference = SessionReference(request.session)
+    return request.state.session_reference
 
 
 class ReadOnlyDict(MutableMapping):
@@ -75,7 +101,7 @@ class Storage:
 
     def __init__(self) -> None:
         self._general = PersistentDict(globals.storage_path / 'storage_general.json')
-        self._users: Dict[str, PersistentDict] = {}
+        self._users: Dict[str, observables.ObservableDict] = {}
 
     @property
     def browser(self) -> Union[ReadOnlyDict, Dict]:
@@ -85,7 +111,7 @@ class Storage:
         Therefore it is normally better to use `app.storage.user` instead,
         which can be modified anytime, reduces overall payload, improves security and has larger storage capacity.
         """
-        request: Optional[Request] = request_contextvar.get()
+        request: Optional[Union[Request, SessionReference]] = request_contextvar.get()
         if request is None:
             if globals.get_client() == globals.index_client:
                 raise RuntimeError('app.storage.browser can only be used with page builder functions '
@@ -106,7 +132,7 @@ class Storage:
         The data is stored in a file on the server.
         It is shared between all browser tabs by identifying the user via session cookie ID.
         """
-        request: Optional[Request] = request_contextvar.get()
+        request: Optional[Union[Request, SessionReference]] = request_contextvar.get()
         if request is None:
             if globals.get_client() == globals.index_client:
                 raise RuntimeError('app.storage.user can only be used with page builder functions '
@@ -115,9 +141,15 @@ class Storage:
                 raise RuntimeError('app.storage.user needs a storage_secret passed in ui.run()')
         session_id = request.session['id']
         if session_id not in self._users:
-            self._users[session_id] = PersistentDict(globals.storage_path / f'storage_user_{session_id}.json')
+            self._users[session_id] = globals.backend.create_user_storage(session_id)
         return self._users[session_id]
 
+    async def _refresh_user(self, session_id: str) -> None:
+        """Load the latest user data which might have been modified by other workers."""
+        if session_id not in self._users:
+            self._users[session_id] = globals.backend.create_user_storage(session_id)
+        await globals.backend.refresh_user_storage(session_id, self._users[session_id])
+
     @property
     def general(self) -> Dict:
         """General storage shared between all users that is persisted on the server (where NiceGUI is executed)."""
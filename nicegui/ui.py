@@ -79,6 +79,7 @@ __all__ = [
     'notify',
     'open',
     'refreshable',
+    'shared_tree',
     'timer',
     'update',
     'page',
@@ -171,6 +172,7 @@ from .functions.javascript import run_javascript
 from .functions.notify import notify
 from .functions.open import open  # pylint: disable=redefined-builtin
 from .functions.refreshable import refreshable
+from .functions.shared_tree import shared_tree
 from .functions.timer import Timer as timer
 from .functions.update import update
 from .page import page
@@ -2,12 +2,13 @@ import importlib
 import os
 import shutil
 from pathlib import Path
-from typing import Dict, Generator
+from typing import Callable, Dict, Generator
 
 import icecream
 import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from starlette.requests import Request
 
 from nicegui import Client, globals  # pylint: disable=redefined-builtin
 from nicegui.elements import plotly, pyplot
@@ -59,6 +60,17 @@ def reset_globals() -> Generator[None, None, None]:
     globals.app.get('/')(globals.index_client.build_response)
 
 
+@pytest.fixture
+def render_page(monkeypatch: pytest.MonkeyPatch) -> Callable[[], str]:
+    """Render the page of the index client like it is served to a new browser, without running a server."""
+    config = {'title': 'NiceGUI', 'viewport': 'width=device-width, initial-scale=1', 'favicon': None, 'dark': False,
+              'language': 'en-US', 'tailwind': True, 'prod_js': True}  # NOTE: usually set by `ui.run`
+    for name, value in config.items():
+        monkeypatch.setattr(globals, name, value, raising=False)
+    request = Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': [], 'query_string': b''})
+    return lambda: bytes(globals.index_client.build_response(request).body).decode()
+
+
 @pytest.fixture(scope='session', autouse=True)
 def remove_all_screenshots() -> None:
     if os.path.exists(Screen.SCREENSHOT_DIR):
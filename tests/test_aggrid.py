@@ -1,8 +1,11 @@
+from typing import Callable
+
 import pandas as pd
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 
-from nicegui import ui
+from nicegui import outbox, ui
+from nicegui.elements.aggrid import AgGridRequest, DataFrameDataSource
 
 from .screen import Screen
 
@@ -174,6 +177,60 @@ def test_create_from_pandas(screen: Screen):
     screen.should_contain('21')
 
 
+def test_create_from_pandas_on_server_side(screen: Screen):
+    df = pd.DataFrame({'name': [f'Person {i}' for i in range(10_000)], 'age': [i % 100 for i in range(10_000)]})
+    ui.aggrid.from_pandas(df, server_side=True)
+
+    screen.open('/')
+    screen.should_contain('Person 0')
+    screen.should_contain('Person 1')
+    screen.should_not_contain('Person 9999')
+
+
+def test_data_frame_data_source():
+    df = pd.DataFrame({'name': ['Alice', 'Bob', 'Carol', 'Dan'], 'age': [18, 21, 42, 21]})
+    source = DataFrameDataSource(df)
+    assert source.fetch(AgGridRequest(start_row=1, end_row=3, sort_model=[], filter_model={})) == \
+        ([{'name': 'Bob', 'age': 21}, {'name': 'Carol', 'age': 42}], 4)
+
+    request = AgGridRequest(start_row=0, end_row=10,
+                            sort_model=[{'colId': 'age', 'sort': 'desc'}],
+                            filter_model={'name': {'filterType': 'text', 'type': 'contains', 'filter': 'A'}})
+    assert source.fetch(request) == \
+        ([{'name': 'Carol', 'age': 42}, {'name': 'Dan', 'age': 21}, {'name': 'Alice', 'age': 18}], 3)
+
+    request = AgGridRequest(start_row=0, end_row=10, sort_model=[], filter_model={'age': {
+        'filterType': 'number', 'operator': 'OR', 'conditions': [
+            {'filterType': 'number', 'type': 'lessThan', 'filter': 20},
+            {'filterType': 'number', 'type': 'greaterThan', 'filter': 40},
+        ],
+    }})
+    assert source.fetch(request) == ([{'name': 'Alice', 'age': 18}, {'name': 'Carol', 'age': 42}], 2)
+
+
+def test_row_transactions(screen: Screen):
+    grid = ui.aggrid({
+        'columnDefs': [{'field': 'name'}, {'field': 'age'}],
+        'rowData': [{'name': 'Alice', 'age': 18}, {'name': 'Bob', 'age': 21}],
+    }, row_key='name')
+    ui.button('Change', on_click=lambda: (
+        grid.add_rows({'name': 'Carol', 'age': 42}),
+        grid.update_rows({'name': 'Alice', 'age': 19}),
+        grid.remove_rows({'name': 'Bob'}),
+    ))
+
+    screen.open('/')
+    screen.should_contain('18')
+    screen.should_contain('Bob')
+
+    screen.click('Change')
+    screen.should_contain('Carol')
+    screen.should_contain('19')
+    screen.should_not_contain('18')
+    screen.should_not_contain('Bob')
+    assert grid.options['rowData'] == [{'name': 'Alice', 'age': 19}, {'name': 'Carol', 'age': 42}]
+
+
 def test_create_dynamically(screen: Screen):
     ui.button('Create', on_click=lambda: ui.aggrid({'columnDefs': [{'field': 'name'}], 'rowData': [{'name': 'Alice'}]}))
 
@@ -189,3 +246,14 @@ def test_api_method_after_creation(screen: Screen):
     screen.open('/')
     screen.click('Create')
     assert screen.find_by_class('ag-row-selected')
+
+
+def test_fresh_page_with_pending_transaction(render_page: Callable[[], str]):
+    # pylint: disable=protected-access
+    grid = ui.aggrid({'columnDefs': [{'field': 'name'}], 'rowData': [{'name': 'Alice'}]}, row_key='name')
+    grid._to_patch(grid._to_dict())  # NOTE: as if the grid has been sent to a browser
+    outbox.update_queue.clear()
+    grid.add_rows({'name': 'Bob'})
+    grid.remove_rows({'name': 'Alice'})
+    assert grid._transaction == {'add': [{'name': 'Bob'}], 'update': [], 'remove': [{'name': 'Alice'}]}
+    assert '"rowData":[{"name":"Bob"}]' in render_page()
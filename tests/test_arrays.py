@@ -0,0 +1,26 @@
+import numpy as np
+
+from nicegui import arrays
+
+
+def test_encode_numeric_arrays():
+    data = {'series': [{'data': np.array([1.0, 2.0], dtype=np.float32)}], 'title': 'Plot'}
+    encoded = arrays.encode(data)
+    assert encoded == {'series': [{'data': {
+        '__nicegui_array__': 'Float32Array',
+        'shape': [2],
+        'buffer': np.array([1.0, 2.0], dtype='<f4').tobytes(),
+    }}], 'title': 'Plot'}
+    assert isinstance(data['series'][0]['data'], np.ndarray), 'the original data must not be modified'
+
+
+def test_encode_converts_unsupported_dtypes():
+    encoded = arrays.encode(np.array([[1, 2], [3, 4]], dtype=np.int64))
+    assert encoded['__nicegui_array__'] == 'Float64Array'
+    assert encoded['shape'] == [2, 2]
+    assert np.frombuffer(encoded['buffer'], dtype='<f8').tolist() == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_encode_keeps_data_without_arrays():
+    data = {'rows': [{'id': 1}, {'id': 2}], 'labels': np.array(['a', 'b'])}
+    assert arrays.encode(data) is data
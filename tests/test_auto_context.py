@@ -133,3 +133,20 @@ def test_adding_elements_from_different_tasks(screen: Screen):
     c1.find_element(By.XPATH, './/*[contains(text(), "1")]')
     c2 = screen.find_element(card2)
     c2.find_element(By.XPATH, './/*[contains(text(), "2")]')
+
+
+def test_slot_stack_is_inherited_by_child_tasks_and_threads():
+    async def build() -> None:
+        with ui.card() as card:
+            async def add_in_task() -> None:
+                with ui.row():
+                    await asyncio.sleep(0)
+                    ui.label('in row')
+                ui.label('in task')
+            task = asyncio.create_task(add_in_task())
+            ui.label('in card')
+            await task
+            await asyncio.to_thread(lambda: ui.label('in thread'))
+        assert [child.text for child in card if isinstance(child, ui.label)] == ['in card', 'in task', 'in thread']
+
+    asyncio.run(build())
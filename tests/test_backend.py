@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any, Dict, List, Set
+
+from nicegui import globals  # pylint: disable=redefined-builtin
+from nicegui.nicegui import handle_backend_message
+from nicegui.backend import RedisBackend, RedisConnection
+
+
+class RedisStandIn:
+    """Tiny in-memory server speaking just enough of the Redis protocol for the backend."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, str] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.subscribers: Dict[str, Set[asyncio.StreamWriter]] = {}
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, 'localhost', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            try:
+                count = int((await reader.readuntil(b'\r\n'))[1:-2])
+            except asyncio.IncompleteReadError:
+                return
+            args = []
+            for _ in range(count):
+                length = int((await reader.readuntil(b'\r\n'))[1:-2])
+                args.append((await reader.readexactly(length + 2))[:-2].decode())
+            writer.write(self.execute(args, writer))
+            await writer.drain()
+
+    def execute(self, args: List[str], writer: asyncio.StreamWriter) -> bytes:
+        command, *params = args
+        if command == 'SET':
+            self.values[params[0]] = params[1]
+            return b'+OK\r\n'
+        if command == 'GET':
+            return encode(self.values.get(params[0]))
+        if command == 'HSET':
+            self.hashes.setdefault(params[0], {})[params[1]] = params[2]
+            return b':1\r\n'
+        if command == 'HGET':
+            return encode(self.hashes.get(params[0], {}).get(params[1]))
+        if command == 'HDEL':
+            for field in params[1:]:
+                self.hashes.get(params[0], {}).pop(field, None)
+            return b':1\r\n'
+        if command == 'SUBSCRIBE':
+            self.subscribers.setdefault(params[0], set()).add(writer)
+            return encode(['subscribe', params[0], 1])
+        if command == 'PUBLISH':
+            for subscriber in self.subscribers.get(params[0], set()):
+                subscriber.write(encode(['message', params[0], params[1]]))
+            return f':{len(self.subscribers.get(params[0], set()))}\r\n'.encode()
+        return f'-ERR unknown command {command}\r\n'.encode()
+
+
+def encode(value: Any) -> bytes:
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, int):
+        return f':{value}\r\n'.encode()
+    if isinstance(value, list):
+        return f'*{len(value)}\r\n'.encode() + b''.join(encode(v) for v in value)
+    return f'${len(value.encode())}\r\n{value}\r\n'.encode()
+
+
+def test_redis_connection():
+    async def run() -> None:
+        port = await RedisStandIn().start()
+        connection = RedisConnection(f'redis://localhost:{port}')
+        await connection.connect()
+        assert await connection.execute('SET', 'key', 'value') == 'OK'
+        assert await connection.execute('GET', 'key') == 'value'
+        assert await connection.execute('GET', 'unknown') is None
+        await connection.close()
+    asyncio.run(run())
+
+
+def test_routing_between_workers():
+    async def run() -> None:
+        globals.loop = asyncio.get_running_loop()
+        port = await RedisStandIn().start()
+        received: List[Dict] = []
+        worker_a = RedisBackend(f'redis://localhost:{port}')
+        worker_b = RedisBackend(f'redis://localhost:{port}')
+        await worker_a.start(received.append)
+        await worker_b.start(lambda _: None)
+
+        worker_a.register_client('some-client')
+        await asyncio.sleep(0.1)
+        assert await worker_b.find_owner('some-client') == worker_a.worker_id
+        assert await worker_b.find_owner('unknown-client') is None
+
+        assert await worker_b.forward(worker_a.worker_id, {'type': 'event', 'client_id': 'some-client'})
+        await asyncio.sleep(0.1)
+        assert received == [{'type': 'event', 'client_id': 'some-client'}]
+        assert not await worker_b.forward('stopped-worker', {'type': 'event', 'client_id': 'some-client'})
+
+        worker_a.unregister_client('some-client')
+        await asyncio.sleep(0.1)
+        assert await worker_b.find_owner('some-client') is None
+    asyncio.run(run())
+
+
+def test_user_storage_between_workers():
+    async def run() -> None:
+        globals.loop = asyncio.get_running_loop()
+        port = await RedisStandIn().start()
+        worker_a = RedisBackend(f'redis://localhost:{port}')
+        worker_b = RedisBackend(f'redis://localhost:{port}')
+        await worker_a.start(lambda _: None)
+        await worker_b.start(lambda _: None)
+
+        storage_a = worker_a.create_user_storage('session')
+        storage_b = worker_b.create_user_storage('session')
+        storage_a['count'] = 1
+        storage_a['items'] = ['a']
+        storage_a['items'].append('b')
+        await asyncio.sleep(0.1)
+        await worker_b.refresh_user_storage('session', storage_b)
+        assert storage_b == {'count': 1, 'items': ['a', 'b']}
+
+        storage_b['count'] = 2
+        await worker_b.refresh_user_storage('session', storage_b)  # NOTE: the pending write is newer than the server
+        assert storage_b['count'] == 2
+        await asyncio.sleep(0.1)
+        await worker_a.refresh_user_storage('session', storage_a)
+        assert storage_a['count'] == 2
+    asyncio.run(run())
+
+
+def test_remote_workers_are_forgotten_on_disconnect():
+    client = globals.index_client
+    handshake = {'type': 'handshake', 'client_id': client.id, 'environ': {}, 'worker_id': 'worker'}
+    disconnect = {'type': 'disconnect', 'client_id': client.id, 'worker_id': 'worker'}
+    asyncio.run(handle_backend_message(handshake))
+    asyncio.run(handle_backend_message({**disconnect, 'is_last': False}))
+    assert client.remote_workers == {'worker'}
+    asyncio.run(handle_backend_message({**disconnect, 'is_last': True}))
+    assert not client.remote_workers
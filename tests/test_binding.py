@@ -1,7 +1,7 @@
 
 from selenium.webdriver.common.keys import Keys
 
-from nicegui import ui
+from nicegui import binding, ui
 
 from .screen import Screen
 
@@ -83,3 +83,88 @@ def test_binding_to_input(screen: Screen):
     element.value = 'five'
     screen.should_contain_input('five')
     assert data.text == 'five'
+
+
+def test_observed_objects_are_not_polled():
+    class Model:
+        def __init__(self) -> None:
+            self.text = 'a'
+    model = Model()
+    label = ui.label().bind_text_from(model, 'text')
+    assert label.text == 'a'
+    assert not any(link[0] is model for link in binding.active_links.values())
+
+    model.text = 'b'
+    assert binding.changed_attributes == {(id(model), 'text'): model}
+    binding.remove([model], Model)
+    assert not binding.changed_attributes
+
+
+def test_mutable_values_of_observed_objects_are_polled():
+    class Model:
+        def __init__(self) -> None:
+            self.items = ['a']
+    model = Model()
+    label = ui.label().bind_text_from(model, 'items', backward=', '.join)
+    assert (id(model), 'items') in binding.polled_attributes
+
+    model.items.append('b')
+    binding.poll(set())
+    assert label.text == 'a, b'
+
+    model.items = 'c'
+    assert (id(model), 'items') not in binding.polled_attributes
+    model.items = ['d']
+    binding.remove([model], Model)
+    assert not binding.polled_attributes
+
+
+def test_classes_with_own_setattr_are_polled():
+    class Model:
+        def __init__(self) -> None:
+            self.text = 'a'
+
+        def __setattr__(self, name: str, value: str) -> None:
+            super().__setattr__(name, value.upper())
+    model = Model()
+    label = ui.label().bind_text_from(model, 'text')
+    assert label.text == 'A'
+    assert any(link[0] is model for link in binding.active_links.values())
+
+
+def test_mappings_are_polled():
+    data = {'text': 'a'}
+    label = ui.label().bind_text_from(data, 'text')
+    assert label.text == 'a'
+    assert any(link[0] is data for link in binding.active_links.values())
+
+    binding.poll(set())
+    data['text'] = 'b'
+    binding.poll(set())
+    assert label.text == 'b'
+
+
+def test_remove_only_touches_bindings_of_removed_objects():
+    class Model:
+        value = binding.BindableProperty()
+
+        def __init__(self) -> None:
+            self.value = 0
+    a, b, c = Model(), Model(), Model()
+    data = {'value': None}
+    binding.bind(a, 'value', b, 'value')
+    binding.bind_to(c, 'value', data, 'value', lambda x: x)
+    binding.bind_from(c, 'value', data, 'value', lambda x: x)
+
+    binding.remove([a], Model)
+    assert (id(a), 'value') not in binding.bindings
+    assert (id(a), 'value') not in binding.bindable_properties
+    assert (id(b), 'value') not in binding.bindings
+    assert (id(c), 'value') in binding.bindings
+    assert id(a) not in binding.keys_by_object and id(b) in binding.keys_by_object
+
+    binding.remove([c], Model)
+    assert (id(c), 'value') not in binding.bindings
+    assert (id(data), 'value') not in binding.bindings
+    assert not any(link[0] is data for link in binding.active_links.values())
+    assert id(data) not in binding.keys_by_object and id(data) not in binding.links_by_object
@@ -0,0 +1,25 @@
+import numpy as np
+
+from nicegui import ui
+
+from .screen import Screen
+
+
+def test_numpy_series(screen: Screen):
+    chart = ui.echart({
+        'xAxis': {'type': 'category', 'data': ['A', 'B', 'C']},
+        'yAxis': {'type': 'value'},
+        'series': [{'type': 'line', 'data': [0, 0, 0]}],
+    })
+
+    def update():
+        chart.options['series'][0]['data'] = np.array([1.0, 2.0, 3.0])  # NOTE: sent as a typed array
+        chart.update()
+    ui.button('Update', on_click=update)
+
+    screen.open('/')
+    screen.click('Update')
+    screen.wait(0.5)
+    data = screen.selenium.execute_script(
+        f'return getElement({chart.id}).chart.getModel().getSeriesByIndex(0).getData().mapArray("y", y => y)')
+    assert data == [1, 2, 3]
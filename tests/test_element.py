@@ -1,6 +1,6 @@
 from selenium.webdriver.common.by import By
 
-from nicegui import ui
+from nicegui import json, ui
 
 from .screen import Screen
 
@@ -52,6 +52,40 @@ def test_props_parsing():
     assert ui.element._parse_props('input-style="{ color: #ff0000 }"') == {'input-style': '{ color: #ff0000 }'}
 
 
+def test_patch_computation():
+    # pylint: disable=protected-access
+    element = ui.element().props('a=1 b=2').classes('x')
+    assert element._to_patch(element._to_dict()) is None
+    assert element._to_patch(element._to_dict()) == {}  # pylint: disable=use-implicit-booleaness-not-comparison
+
+    element.props('a=3', remove='b')
+    element.classes('y')
+    assert element._to_patch(element._to_dict()) == {'class': ['x', 'y'], 'props': {'a': '3'}, 'removed_props': ['b']}
+
+    element._props['rows'] = [{'id': 1}]
+    assert element._to_patch(element._to_dict()) == {'props': {'rows': [{'id': 1}]}}
+    element._props['rows'].append({'id': 2})
+    assert element._to_patch(element._to_dict()) == {'props': {'rows': [{'id': 1}, {'id': 2}]}}
+
+
+def test_json_cache():
+    # pylint: disable=protected-access
+    label = ui.label('Hello').props('a=1').classes('x')
+    label.on('click', lambda: None)
+    assert json.loads(label._to_json()) == json.loads(json.dumps(label._to_dict()))
+    assert label._to_json() is label._to_json()
+
+    label.set_text('World')
+    assert json.loads(label._to_json())['text'] == 'World'
+
+    with label:
+        child = ui.element()
+    assert json.loads(label._to_json())['slots']['default']['ids'] == [child.id]
+
+    label.props(remove='a')
+    assert json.loads(label._to_json())['props'] == {'key': label.id}
+
+
 def test_style(screen: Screen):
     label = ui.label('Some label')
 
@@ -1,7 +1,10 @@
+import asyncio
+
 import pytest
 
 from nicegui import Client, ui
 from nicegui.events import ValueChangeEventArguments
+from nicegui.page import page
 
 from .screen import Screen
 
@@ -89,3 +92,21 @@ def test_simultaneous_async_javascript(screen: Screen):
     screen.click('runB')
     screen.should_contain('A: 1')
     screen.should_contain('B: 2')
+
+
+def test_response_is_passed_to_waiting_call():
+    client = Client(page('/'))
+
+    async def run() -> None:
+        task = asyncio.create_task(client.run_javascript('return 42'))
+        await asyncio.sleep(0)
+        request_id = next(iter(client.waiting_javascript_commands))
+        client.handle_javascript_response({'request_id': request_id, 'result': 42})
+        assert await task == 42
+        assert not client.waiting_javascript_commands
+
+        with pytest.raises(TimeoutError):
+            await client.run_javascript('return 42', timeout=0.01)
+        assert not client.waiting_javascript_commands
+
+    asyncio.run(run())
@@ -1,6 +1,12 @@
+import asyncio
+from pathlib import Path
 from typing import List
 
-from nicegui import Client, app, ui
+import pytest
+
+from nicegui import Client, app, globals, ui  # pylint: disable=redefined-builtin
+from nicegui.nicegui import evict_clients_exceeding_limits
+from nicegui.page import page
 
 from .screen import Screen
 
@@ -78,3 +84,57 @@ def test_startup_and_shutdown_handlers(screen: Screen):
     app.shutdown()
     screen.wait(0.5)
     assert events == ['startup', 'startup_async', 'startup_async', 'shutdown', 'shutdown_async', 'shutdown_async']
+
+
+def test_hibernation():
+    # pylint: disable=protected-access
+    client = Client(page('/'))
+    with client:
+        label = ui.label('Hello')
+    for element in client.elements.values():
+        element._to_patch(element._to_dict())
+
+    client.hibernate()
+    assert label._synced_state is None and label._encoded is None and label._json is None
+
+    label.text = 'World'
+    assert label._to_patch(label._to_dict()) is None  # NOTE: the element is sent in full
+    client.wake()
+    assert not client.is_hibernating
+
+
+def test_memory_usage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # pylint: disable=protected-access
+    monkeypatch.setattr(globals, 'storage_path', tmp_path)
+    client = Client(page('/'))
+    with client:
+        button = ui.button('Click me', on_click=lambda: None)
+    assert client.memory_usage().prop_bytes == 0  # NOTE: the element data has not been encoded yet
+    json_bytes = sum(len(element._to_json()) for element in client.elements.values())  # NOTE: as for a new page
+    usage = client.memory_usage()
+    assert usage.elements == len(client.elements)
+    assert usage.listeners == 1
+    assert usage.prop_bytes == json_bytes
+    assert usage.queue_bytes == 0
+    assert usage.total_bytes == usage.prop_bytes
+
+    client.hibernate()
+    assert client.memory_usage().prop_bytes == usage.prop_bytes
+    button.parent_slot.parent.clear()
+    assert client.memory_usage().prop_bytes == usage.prop_bytes - len(button._to_json())
+
+
+def test_disconnected_or_idle_clients_are_evicted(monkeypatch: pytest.MonkeyPatch):
+    # pylint: disable=protected-access
+    active, idle, disconnected, small = Client(page('/')), Client(page('/')), Client(page('/')), Client(page('/'))
+    for client in (active, idle, disconnected, small):
+        with client:
+            ui.label('x' * (1000 if client is not small else 10))._to_json()
+    active.environ = idle.environ = {}
+    idle.last_activity -= globals.eviction_idle_timeout + 1
+    monkeypatch.setattr(globals, 'max_client_bytes', 1000)
+    asyncio.run(evict_clients_exceeding_limits())
+    assert active.id in globals.clients
+    assert idle.id not in globals.clients
+    assert disconnected.id not in globals.clients
+    assert small.id in globals.clients
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections import deque
+
+from socketio import packet
+
+from nicegui import globals, json, outbox, ui  # pylint: disable=redefined-builtin
+
+
+def test_patch_json():
+    # pylint: disable=protected-access
+    element = ui.element().props('a=1 b=2').classes('x')
+    element._to_patch(element._to_dict())
+    element.props('a="<3>"', remove='b')
+    patch = element._to_patch(element._to_dict())
+    assert json.loads(element._patch_to_json(patch)) == patch
+
+
+def test_shared_containers_are_encoded_once():
+    rows = [{'id': 1}]
+    outbox.encoding_cache = {}
+    try:
+        assert outbox.dumps(rows) is outbox.dumps(rows)
+        assert outbox.dumps(list(rows)) is not outbox.dumps(rows)
+    finally:
+        outbox.encoding_cache = None
+
+
+def test_identical_frames_are_encoded_once():
+    # pylint: disable=protected-access
+    try:
+        outbox.encoding_cache = {}
+        data = {'text': 'Hello'}
+        messages = [('patch', data, None, None), ('notify', 'Hi', None, None)]
+        encoded = outbox._encode_packet(messages, outbox._encode_frame(messages))
+        frame = ['messages', [['patch', data], ['notify', 'Hi']]]
+        assert encoded == globals.sio.packet_class(packet.EVENT, data=frame).encode()
+        assert outbox._parts(encoded, 7) == [globals.sio.packet_class(packet.EVENT, data=['seq', 7]).encode(), encoded]
+        assert outbox._encode_frame([('patch', dict(data), None, json.dumps(data)), ('notify', 'Hi', None, None)]) is \
+            outbox._encode_frame([('patch', dict(data), None, json.dumps(data)), ('notify', 'Hi', None, None)])
+    finally:
+        outbox.encoding_cache = None
+        outbox.frame_cache.clear()
+
+
+def test_superseded_messages_are_dropped_from_backlog():
+    # pylint: disable=protected-access
+    try:
+        backlog = [
+            ('update', {1: {'text': 'a'}, 2: {'text': 'b'}}, None, '{}'),
+            ('patch', {1: {'text': 'c'}}, None, '{}'),
+        ]
+        backlog = outbox._supersede('target', backlog, [('notify', 'Hi', None, None)])
+        backlog = outbox._supersede('target', backlog, [('update', {1: {'text': 'd'}}, None, None)])
+        assert backlog == [
+            ('update', {2: {'text': 'b'}}, None, None),
+            ('notify', 'Hi', None, None),
+            ('update', {1: {'text': 'd'}}, None, None),
+        ]
+        assert outbox.drop_counts['target'] == 2
+    finally:
+        outbox.drop_counts.clear()
+
+
+def test_missed_frames_are_replayed_from_history():
+    try:
+        outbox.sequence_numbers['target'] = 5
+        outbox.history['target'] = deque([(4, '4'), (5, '5')])
+        assert outbox.last_sequence_number('target') == 5
+        assert not asyncio.run(outbox.replay('target', 'sid', 2))  # NOTE: frame 3 is not available anymore
+    finally:
+        outbox.forget('target')
+    assert outbox.last_sequence_number('target') == 0
+
+
+def test_removed_subtrees_are_deleted_by_their_roots():
+    # pylint: disable=protected-access
+    with ui.row() as row:
+        with ui.column() as column:
+            label = ui.label('A')
+        other = ui.label('B')
+    outbox.update_queue.clear()
+    column.remove(0)
+    row.clear()
+    assert label.id not in row.client.elements
+    messages = outbox._collect_frames()[row.client.id]
+    assert [message_type for message_type, _, _, _ in messages] == ['update', 'delete']
+    assert messages[-1][1] == [label.id, column.id, other.id]
+
+
+def test_coalescing_is_bounded_by_max_latency():
+    # pylint: disable=protected-access
+    async def measure(keep_enqueuing: bool) -> float:
+        outbox.enqueue_event = asyncio.Event()
+
+        async def enqueue() -> None:
+            while keep_enqueuing:
+                await asyncio.sleep(0.02)
+                outbox.enqueue_event.set()
+        task = asyncio.create_task(enqueue())
+        t = time.time()
+        await outbox._coalesce()
+        task.cancel()
+        return time.time() - t
+
+    globals.outbox_coalescing_window = 0.05
+    globals.outbox_max_latency = 0.2
+    try:
+        assert 0.04 < asyncio.run(measure(keep_enqueuing=False)) < 0.15
+        assert 0.19 < asyncio.run(measure(keep_enqueuing=True)) < 0.3
+        globals.outbox_coalescing_window = 0.0
+        assert asyncio.run(measure(keep_enqueuing=True)) < 0.01
+    finally:
+        outbox.enqueue_event = None
+        globals.outbox_coalescing_window = 0.0
+        globals.outbox_max_latency = 0.1
+
+
+def test_history_is_limited_by_bytes():
+    # pylint: disable=protected-access
+    globals.outbox_history_bytes = 10
+    try:
+        for seq in range(1, 5):
+            outbox._remember('target', seq, str(seq) * 4)
+        assert [seq for seq, _ in outbox.history['target']] == [3, 4]
+        assert outbox.history_bytes['target'] == 8
+    finally:
+        globals.outbox_history_bytes = 1_000_000
+        outbox.forget('target')
+
+
+def test_frames_for_sockets_are_not_numbered():
+    # pylint: disable=protected-access
+    async def send() -> None:
+        outbox.send_queues['sid'] = ([('run_method', {'id': 1, 'name': 'init', 'args': []}, None, None)], None)
+        outbox.senders['sid'] = asyncio.current_task()
+        await outbox._send('sid')
+    asyncio.run(send())
+    assert outbox.last_sequence_number('sid') == 0
+    assert 'sid' not in outbox.history
+
+
+def test_overflowing_backlog_keeps_other_messages():
+    # pylint: disable=protected-access
+    outbox.senders['target'] = None  # NOTE: the sender is busy
+    globals.outbox_max_pending = 2
+    try:
+        outbox._schedule('target', [('patch', {1: {}}, None, None), ('run_javascript', {'code': 'x'}, None, None)])
+        outbox._schedule('target', [('patch', {2: {}}, None, None), ('notify', 'Hi', None, None)])
+        assert outbox.send_queues['target'][0] == [
+            ('run_javascript', {'code': 'x'}, None, None),
+            ('notify', 'Hi', None, None),
+        ]
+        assert outbox.drop_counts['target'] == 2
+    finally:
+        globals.outbox_max_pending = 1000
+        outbox.senders.pop('target')
+        outbox.send_queues.pop('target')
+        outbox.forget('target')
+
+
+def test_sender_waits_for_sockets_to_drain(monkeypatch):
+    # pylint: disable=protected-access
+    queued = [50]
+    monkeypatch.setattr(outbox, '_queued_packets', lambda target_id: queued)
+
+    async def drain() -> bool:
+        task = asyncio.create_task(outbox._drain('target'))
+        await asyncio.sleep(0.05)
+        was_waiting = not task.done()
+        queued[0] = 0
+        await asyncio.wait_for(task, 1)
+        return was_waiting
+    assert asyncio.run(drain())
@@ -283,3 +283,25 @@ def test_returning_custom_response_async(screen: Screen):
     screen.open('/?plain=true')
     screen.should_contain('custom response')
     screen.should_not_contain('normal NiceGUI page')
+
+
+def test_reusing_page_shell(screen: Screen):
+    @ui.page('/', title='Page A')
+    def page_a():
+        ui.button('Click A', on_click=lambda: ui.label('clicked A'))
+
+    @ui.page('/b', title='Page B')
+    def page_b():
+        ui.button('Click B', on_click=lambda: ui.label('clicked B'))
+        ui.joystick()
+
+    for _ in range(2):
+        screen.open('/')
+        screen.should_contain('Page A')
+        screen.click('Click A')
+        screen.should_contain('clicked A')
+
+        screen.open('/b')
+        screen.should_contain('Page B')
+        screen.click('Click B')
+        screen.should_contain('clicked B')
@@ -1,6 +1,7 @@
 import asyncio
+from typing import Dict, List
 
-from nicegui import ui
+from nicegui import globals, outbox, ui  # pylint: disable=redefined-builtin
 
 from .screen import Screen
 
@@ -177,3 +178,100 @@ def test_refresh_with_function_reference(screen: Screen):
     screen.should_contain('Refreshing A')
     screen.click('B')
     screen.should_contain('Refreshing B')
+
+
+def test_keyed_refresh_keeps_element_ids():
+    # pylint: disable=protected-access
+    items = ['A', 'B']
+
+    @ui.refreshable
+    def list_ui():
+        for item in items:
+            with ui.row().keyed(item):
+                ui.label(item)
+
+    list_ui()
+    container = list_ui.targets[0].container
+    rows = {row._key: row for row in container}
+    label_b = next(iter(rows['B']))
+
+    items[:] = ['B', 'C']
+    list_ui.refresh()
+    new_rows = list(container)
+    assert new_rows[0] is not rows['B'] and new_rows[0].id == rows['B'].id
+    assert next(iter(new_rows[0])).id == label_b.id
+    assert new_rows[1].id not in {row.id for row in rows.values()}
+    assert rows['A'].id not in container.client.elements
+    assert container.client.elements[rows['B'].id] is new_rows[0]
+
+
+def test_keyed_refresh_with_duplicate_keys():
+    items = ['A', 'A', 'B']
+
+    @ui.refreshable
+    def list_ui():
+        for item in items:
+            ui.label(item).keyed(item)
+
+    list_ui()
+    container = list_ui.targets[0].container
+    previous = list(container)
+
+    items[:] = ['B']
+    list_ui.refresh()
+    assert [label.id for label in container] == [previous[2].id]
+    assert previous[0].id not in container.client.elements
+    assert previous[1].id not in container.client.elements
+
+
+def test_async_keyed_refresh_keeps_new_children_in_the_browser():
+    # pylint: disable=protected-access
+    browser: Dict[int, Dict] = {}
+
+    def receive(messages: List) -> None:
+        for message_type, data, _, _ in messages:
+            if message_type == 'update':
+                browser.update(data)
+            elif message_type == 'patch':
+                for id, patch in data.items():  # pylint: disable=redefined-builtin
+                    browser[id].update({key: value for key, value in patch.items() if key != 'props'})
+            elif message_type == 'delete':
+                ids = list(data)
+                while ids:
+                    element = browser.pop(ids.pop(), None)
+                    if element is not None:
+                        ids.extend(id for slot in element['slots'].values() for id in slot['ids'])
+            elif message_type == 'forget':
+                for id in data:
+                    browser.pop(id, None)
+
+    def flush() -> None:
+        receive(outbox._collect_frames().get(globals.index_client.id, []))
+
+    labels = ['1']
+
+    @ui.refreshable
+    async def list_ui():
+        with ui.column().keyed('column'):
+            for label in labels:
+                ui.label(label).keyed(label)
+                await asyncio.sleep(0)
+
+    async def run() -> None:
+        globals.loop = asyncio.get_running_loop()
+        outbox.update_queue.clear()
+        await list_ui()
+        flush()
+        labels.append('2')
+        list_ui.refresh()
+        for _ in range(5):
+            await asyncio.sleep(0)
+            flush()  # NOTE: the new column and its labels are sent with their own IDs while the builder is waiting
+    try:
+        asyncio.run(run())
+    finally:
+        globals.loop = None
+
+    column = next(iter(list_ui.targets[0].container))
+    assert [browser[label.id]['text'] for label in column] == ['1', '2']
+    assert browser[column.id]['slots']['default']['ids'] == [label.id for label in column]
@@ -0,0 +1,48 @@
+import pytest
+
+from nicegui import Client, ui
+from nicegui.page import page
+
+from .screen import Screen
+
+
+def test_shared_tree(screen: Screen):
+    tree = ui.shared_tree()
+    with tree:
+        label = ui.label('Status: ok')
+        ui.button('Add', on_click=lambda: ui.label('added'))
+
+    @ui.page('/')
+    def index():
+        ui.label('Host page')
+        tree.mount()
+
+    screen.open('/')
+    screen.should_contain('Host page')
+    screen.should_contain('Status: ok')
+
+    label.set_text('Status: failed')
+    screen.should_contain('Status: failed')
+
+    screen.click('Add')
+    screen.should_contain('added')
+
+
+def test_shared_elements_exist_once():
+    tree = ui.shared_tree()
+    with tree:
+        ui.label('shared')
+
+    clients = [Client(page('/')) for _ in range(3)]
+    for client in clients:
+        with client:
+            tree.mount()
+            with pytest.raises(ValueError):
+                tree.mount()
+    assert tree.client.subscriber_ids == {client.id for client in clients}
+    for client in clients:
+        assert client.find_element(tree.root.id) is tree.root
+
+    clients[0].content.clear()
+    assert clients[0].id not in tree.client.subscriber_ids
+    assert len(tree.elements()) == 2
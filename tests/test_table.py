@@ -1,8 +1,9 @@
-from typing import List
+from typing import Callable, Dict, List, Tuple
 
 from selenium.webdriver.common.by import By
 
-from nicegui import ui
+from nicegui import outbox, ui
+from nicegui.elements.table import ListDataSource, TableRequest
 
 from .screen import Screen
 
@@ -73,6 +74,25 @@ def test_add_remove(screen: Screen):
     screen.should_not_contain('Alice')
 
 
+def test_update_rows(screen: Screen):
+    table = ui.table(columns=columns(), rows=rows(), selection='multiple')
+    ui.button('Update', on_click=lambda: table.update_rows({'id': 1, 'name': 'Robert', 'age': 22}))
+    ui.button('Add and remove', on_click=lambda: (table.add_rows({'id': 3, 'name': 'Carol', 'age': 32}),
+                                                  table.remove_rows(table.rows[0])))
+
+    screen.open('/')
+    screen.click('Update')
+    screen.should_contain('Robert')
+    screen.should_not_contain('Bob')
+    assert table.rows[1] == {'id': 1, 'name': 'Robert', 'age': 22}
+
+    screen.click('Add and remove')
+    screen.should_contain('Carol')
+    screen.should_not_contain('Alice')
+    screen.should_contain('Robert')
+    screen.should_contain('Lionel')
+
+
 def test_slots(screen: Screen):
     with ui.table(columns=columns(), rows=rows()) as table:
         with table.add_slot('top-row'):
@@ -128,3 +148,55 @@ def test_remove_selection(screen: Screen):
     screen.wait(0.5)
     screen.should_not_contain('Alice')
     screen.should_not_contain('1 record selected.')
+
+
+def test_server_side_pagination(screen: Screen):
+    ui.table(columns=columns(), rows=rows(), pagination=2, server_side=True)
+
+    screen.open('/')
+    screen.should_contain('Alice')
+    screen.should_contain('Bob')
+    screen.should_not_contain('Lionel')
+    screen.should_contain('1-2 of 3')
+
+    screen.click('Age')
+    screen.wait(0.5)
+    screen.should_contain('Alice')
+    screen.should_contain('Lionel')
+    screen.should_not_contain('Bob')
+
+
+def test_server_side_data_source(screen: Screen):
+    def fetch(request: TableRequest) -> Tuple[List[Dict], int]:
+        return [{'id': i, 'name': f'Row {i}', 'age': i} for i in range(request.start, request.stop)], 1_000_000
+    ui.table(columns=columns(), rows=fetch, pagination=5)
+
+    screen.open('/')
+    screen.should_contain('Row 4')
+    screen.should_not_contain('Row 5')
+    screen.should_contain('1-5 of 1000000')
+
+    screen.click('chevron_right')
+    screen.should_contain('Row 5')
+    screen.should_not_contain('Row 4')
+
+
+def test_list_data_source():
+    source = ListDataSource(rows(), columns())
+    request = TableRequest(page=1, rows_per_page=2, sort_by='age', descending=True, filter='l')
+    assert source.fetch(request) == ([{'id': 2, 'name': 'Lionel', 'age': 19}, {'id': 0, 'name': 'Alice', 'age': 18}], 2)
+    request = TableRequest(page=2, rows_per_page=2, sort_by=None, descending=False, filter=None)
+    assert source.fetch(request) == ([{'id': 2, 'name': 'Lionel', 'age': 19}], 3)
+
+
+def test_fresh_page_after_updating_a_selected_row(render_page: Callable[[], str]):
+    # pylint: disable=protected-access
+    table = ui.table(columns=columns(), rows=rows()[:2], selection='single')
+    table.selected.append(table.rows[0])
+    table._to_patch(table._to_dict())  # NOTE: as if the table has been sent to a browser
+    outbox.update_queue.clear()
+    table.update_rows({'id': 0, 'name': 'Alice', 'age': 19})
+    assert table.id not in outbox.update_queue[table.client.id]
+    page = render_page()
+    assert '"rows":[{"id":0,"name":"Alice","age":19},{"id":1,"name":"Bob","age":21}]' in page
+    assert '"selected":[{"id":0,"name":"Alice","age":19}]' in page
@@ -332,6 +332,7 @@ def create_full() -> None:
             ui.button('Clear', on_click=clear)
 
     load_demo(ui.refreshable)
+    load_demo(ui.shared_tree)
 
     @text_demo('Async event handlers', '''
         Most elements also support asynchronous event handlers.
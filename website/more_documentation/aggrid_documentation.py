@@ -123,6 +123,20 @@ def more() -> None:
         df = pd.DataFrame(data={'col1': [1, 2], 'col2': [3, 4]})
         ui.aggrid.from_pandas(df).classes('max-h-40')
 
+    @text_demo('Serve large Dataframes from the server', '''
+        With `server_side=True` the grid uses AG Grid's infinite row model.
+        Only the visible blocks of rows are converted and sent to the browser,
+        while sorting and filtering happen on the server.
+    ''')
+    def aggrid_server_side():
+        import numpy as np
+        import pandas as pd
+
+        df = pd.DataFrame(data={'x': np.arange(1_000_000), 'y': np.random.rand(1_000_000)})
+        ui.aggrid.from_pandas(df, server_side=True, options={
+            'defaultColDef': {'sortable': True, 'filter': 'agNumberColumnFilter'},
+        }).classes('h-60')
+
     @text_demo('Render columns as HTML', '''
         You can render columns as HTML by passing a list of column indices to the `html_columns` argument.
     ''')
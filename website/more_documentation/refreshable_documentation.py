@@ -67,3 +67,26 @@ def more() -> None:
                         ui.label(rule).classes('text-xs text-red')
 
         show_info()
+
+    @text_demo('Keyed refreshable UI', '''
+        Elements can be marked with a key to identify them across refreshes.
+        When refreshing, the new elements take the place of the previous ones with the same type and key,
+        so that only the changes are sent to the browser.
+        Elements without key are matched by their position among their siblings.
+    ''')
+    def keyed_refreshable():
+        tasks = ['Buy milk', 'Call mom']
+
+        @ui.refreshable
+        def task_list() -> None:
+            for task in tasks:
+                with ui.row().classes('items-center').keyed(task):
+                    ui.icon('task_alt')
+                    ui.label(task)
+
+        def add_task() -> None:
+            tasks.append(f'Task {len(tasks) + 1}')
+            task_list.refresh()
+
+        task_list()
+        ui.button('Add task', on_click=add_task)
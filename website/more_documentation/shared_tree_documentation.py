@@ -0,0 +1,23 @@
+from nicegui import ui
+
+clicks = {'count': 0}
+counter = ui.shared_tree()
+with counter:
+    ui.button(on_click=lambda: clicks.update(count=clicks['count'] + 1)) \
+        .bind_text_from(clicks, 'count', lambda count: f'Clicked {count} times')
+
+
+def main_demo() -> None:
+    # clicks = {'count': 0}
+    # counter = ui.shared_tree()
+    # with counter:
+    #     ui.button(on_click=lambda: clicks.update(count=clicks['count'] + 1)) \
+    #         .bind_text_from(clicks, 'count', lambda count: f'Clicked {count} times')
+    #
+    # @ui.page('/')
+    # def index():
+    #     ui.label('Every visitor sees the same counter:')
+    #     counter.mount()
+    # END OF DEMO
+    ui.label('Every visitor sees the same counter:')
+    counter.mount()
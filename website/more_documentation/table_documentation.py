@@ -201,3 +201,22 @@ def more() -> None:
                 table.toggle_fullscreen()
                 button.props('icon=fullscreen_exit' if table.is_fullscreen else 'icon=fullscreen')
             button = ui.button('Toggle fullscreen', icon='fullscreen', on_click=toggle).props('flat')
+
+    @text_demo('Server-side pagination', '''
+        With `server_side=True` only the rows of the current page are sent to the browser.
+        Sorting, filtering and pagination happen on the server.
+        Instead of a list you can pass a (possibly async) function which receives a `TableRequest`
+        and returns the rows of the requested page together with the total number of rows.
+    ''')
+    def server_side_pagination():
+        columns = [
+            {'name': 'id', 'label': 'ID', 'field': 'id', 'sortable': True},
+            {'name': 'square', 'label': 'Square', 'field': 'square'},
+        ]
+
+        def fetch(request):
+            ids = range(1_000_000)[::-1] if request.descending else range(1_000_000)
+            rows = [{'id': i, 'square': i * i} for i in ids[request.start:request.stop]]
+            return rows, len(ids)
+
+        ui.table(columns=columns, rows=fetch, pagination=5).classes('w-full')